@@ -0,0 +1,113 @@
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+from .workloads import WORKLOADS, Workload
+
+Result = Dict[str, float]
+
+
+def measure(workload: Workload, repeat: int) -> Result:
+    workload.run()
+    times: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        workload.run()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+
+    gc.collect()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        result = workload.run()
+        allocs = sys.getallocatedblocks() - before
+    finally:
+        gc.enable()
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        workload.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "time": best,
+        "throughput": workload.units / best,
+        "peak": peak,
+        "allocs": allocs,
+    }
+
+
+def compare(
+        results: Dict[str, Result], baseline: Dict[str, Result],
+        threshold: float) -> List[str]:
+    regressions: List[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in ("time", "peak"):
+            old = baseline[name][key]
+            if old and result[key] > old * (1 + threshold):
+                regressions.append("{} {}: {:.4g} -> {:.4g} (+{:.0%})".format(
+                    name, key, old, result[key], result[key] / old - 1
+                ))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    parser.add_argument("workloads", nargs="*", metavar="workload")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="FILE")
+    parser.add_argument("--compare", metavar="FILE")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(
+            "unknown workloads: {}".format(", ".join(sorted(unknown)))
+        )
+
+    results: Dict[str, Result] = {}
+    print("{:<20} {:>10} {:>14} {:>10} {:>10}".format(
+        "workload", "time, ms", "units/s", "peak, KiB", "allocs"
+    ))
+    for name in args.workloads or WORKLOADS:
+        result = measure(WORKLOADS[name](args.scale), args.repeat)
+        results[name] = result
+        print("{:<20} {:>10.2f} {:>14.0f} {:>10.0f} {:>10.0f}".format(
+            name, result["time"] * 1000, result["throughput"],
+            result["peak"] / 1024, result["allocs"]
+        ))
+
+    if args.save:
+        with open(args.save, "w") as fp:
+            json.dump({"scale": args.scale, "results": results}, fp, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        if baseline["scale"] != args.scale:
+            print("baseline was recorded with --scale {}".format(
+                baseline["scale"]
+            ))
+            return 2
+        regressions = compare(results, baseline["results"], args.threshold)
+        for regression in regressions:
+            print("regression:", regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
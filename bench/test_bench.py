@@ -0,0 +1,19 @@
+import pytest
+
+from bench.__main__ import compare, measure
+from bench.workloads import WORKLOADS
+
+
+@pytest.mark.parametrize("name", WORKLOADS)
+def test_workload(name: str) -> None:
+    result = measure(WORKLOADS[name](1), 1)
+    assert result["time"] > 0
+    assert result["peak"] > 0
+
+
+def test_compare() -> None:
+    baseline = {"a": {"time": 1.0, "peak": 100.0}}
+    assert compare({"a": {"time": 1.05, "peak": 100.0}}, baseline, 0.1) == []
+    assert compare({"a": {"time": 1.2, "peak": 90.0}}, baseline, 0.1) == [
+        "a time: 1 -> 1.2 (+20%)"
+    ]
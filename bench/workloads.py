@@ -0,0 +1,121 @@
+import json as std_json
+import os
+import random
+import sys
+from io import StringIO
+from typing import Callable, Dict, NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (
+        ROOT, os.path.join(ROOT, "compiler"),
+        os.path.join(ROOT, "dsltoys")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from part7 import translate  # noqa: E402
+from pretty import P, Pretty  # noqa: E402
+
+from combinators import json, jsonstream  # noqa: E402
+from combinators.lexer import split_tokens  # noqa: E402
+from expressions import pratt  # noqa: E402
+
+
+class Workload(NamedTuple):
+    run: Callable[[], object]
+    units: int
+
+
+def _json_value(rnd: random.Random, depth: int, width: int) -> object:
+    if depth == 0:
+        return rnd.choice([1, -2.5e3, "text\n", True, False, None])
+    if rnd.random() < 0.5:
+        return [_json_value(rnd, depth - 1, width) for _ in range(width)]
+    return {
+        "key{}".format(i): _json_value(rnd, depth - 1, width)
+        for i in range(width)
+    }
+
+
+def json_wide(scale: int) -> Workload:
+    rnd = random.Random(0)
+    src = std_json.dumps(
+        [_json_value(rnd, 2, 4) for _ in range(200 * scale)]
+    )
+    return Workload(lambda: json.parse(src), len(split_tokens(src, json.spec)))
+
+
+def json_deep(scale: int) -> Workload:
+    src = std_json.dumps([
+        {"a": "[" * 20 + str(i) + "]" * 20} for i in range(100 * scale)
+    ]).replace('"[', "[").replace(']"', "]")
+    return Workload(lambda: json.parse(src), len(split_tokens(src, json.spec)))
+
+
+def json_recover(scale: int) -> Workload:
+    rnd = random.Random(1)
+    src = std_json.dumps(
+        [_json_value(rnd, 2, 4) for _ in range(20 * scale)]
+    ).replace(",", " ", 10 * scale)
+    tokens = split_tokens(src, json.spec)
+    return Workload(lambda: json.json.parse(tokens, recover=True), len(tokens))
+
+
+def json_recover_nested(scale: int) -> Workload:
+    src = '{"items": [' + ", ".join(
+        ['{"a": [1, 2], "b": tru}'] * (100 * scale)
+    ) + "]}"
+    tokens = split_tokens(src, json.spec)
+    return Workload(lambda: json.json.parse(tokens, recover=True), len(tokens))
+
+
+def json_stream(scale: int) -> Workload:
+    rnd = random.Random(2)
+    src = std_json.dumps(
+        [_json_value(rnd, 2, 4) for _ in range(200 * scale)]
+    )
+    return Workload(
+        lambda: sum(1 for _ in jsonstream.items(StringIO(src))),
+        len(split_tokens(src, json.spec))
+    )
+
+
+def pratt_chain(scale: int) -> Workload:
+    rnd = random.Random(3)
+    ops = "+-*/^"
+    terms = ["a", "-b", "(c + 1)", "d!", "42"]
+    size = 2000 * scale
+    src = " ".join(
+        rnd.choice(terms) + " " + rnd.choice(ops) for _ in range(size)
+    ) + " x"
+    return Workload(lambda: pratt.parse(src), 2 * size + 1)
+
+
+def pretty_wide(scale: int) -> Workload:
+    size = 500 * scale
+    doc = P
+    for i in range(size):
+        doc = doc.group(
+            P.nest(2, P.text("item{}".format(i)).sp().text("=").sp()
+                   .text(str(i))).text(";").sp()
+        )
+    wrapped: Pretty = doc.wrap_in_group()
+    return Workload(lambda: wrapped.to_string(80), size)
+
+
+def compiler_rpn(scale: int) -> Workload:
+    size = 2000 * scale
+    src = "1 " + " ".join("{} {}".format(i % 97, "+*"[i % 2])
+                          for i in range(size))
+    return Workload(lambda: translate(src), size)
+
+
+WORKLOADS: Dict[str, Callable[[int], Workload]] = {
+    "json_wide": json_wide,
+    "json_deep": json_deep,
+    "json_recover": json_recover,
+    "json_recover_nested": json_recover_nested,
+    "json_stream": json_stream,
+    "pratt_chain": pratt_chain,
+    "pretty_wide": pretty_wide,
+    "compiler_rpn": compiler_rpn,
+}
@@ -1,31 +1,83 @@
-from typing import Generic, Iterable, Iterator, TypeVar
+from abc import abstractmethod
+from typing import Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 T = TypeVar("T")
 T_co = TypeVar("T_co", covariant=True)
-V = TypeVar("V")
 
 
-class _Pair(Generic[T, V]):
+class _Node(Iterable[T_co]):
+    __slots__ = "_flat",
+
+    def __init__(self) -> None:
+        self._flat: Optional[Tuple[T_co, ...]] = None
+
+    @abstractmethod
+    def _parts(self) -> Tuple[Iterable[T_co], Iterable[T_co]]:
+        ...
+
+    def __iter__(self) -> Iterator[T_co]:
+        if self._flat is None:
+            self._flat = tuple(_walk(self))
+        return iter(self._flat)
+
+
+def _walk(root: Iterable[T]) -> Iterator[T]:
+    stack: List[Iterable[T]] = [root]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, _Node):
+            yield from node
+        elif node._flat is not None:
+            yield from node._flat
+        else:
+            fst, snd = node._parts()
+            stack.append(snd)
+            stack.append(fst)
+
+
+class Chain(_Node[T_co]):
     __slots__ = "_fst", "_snd"
 
-    def __init__(self, fst: T, snd: V):
+    def __init__(self, fst: Iterable[T_co], snd: Iterable[T_co]):
+        super().__init__()
         self._fst = fst
         self._snd = snd
 
+    def _parts(self) -> Tuple[Iterable[T_co], Iterable[T_co]]:
+        return self._fst, self._snd
 
-class Chain(_Pair[Iterable[T_co], Iterable[T_co]], Iterable[T_co]):
-    def __iter__(self) -> Iterator[T_co]:
-        yield from self._fst
-        yield from self._snd
 
+class ChainL(_Node[T_co]):
+    __slots__ = "_fst", "_snd"
 
-class ChainL(_Pair[T_co, Iterable[T_co]], Iterable[T_co]):
-    def __iter__(self) -> Iterator[T_co]:
-        yield self._fst
-        yield from self._snd
+    def __init__(self, fst: T_co, snd: Iterable[T_co]):
+        super().__init__()
+        self._fst = fst
+        self._snd = snd
 
+    def _parts(self) -> Tuple[Iterable[T_co], Iterable[T_co]]:
+        return (self._fst,), self._snd
 
-class ChainR(_Pair[Iterable[T_co], T_co], Iterable[T_co]):
-    def __iter__(self) -> Iterator[T_co]:
-        yield from self._fst
-        yield self._snd
+
+class ChainR(_Node[T_co]):
+    __slots__ = "_fst", "_snd"
+
+    def __init__(self, fst: Iterable[T_co], snd: T_co):
+        super().__init__()
+        self._fst = fst
+        self._snd = snd
+
+    def _parts(self) -> Tuple[Iterable[T_co], Iterable[T_co]]:
+        return self._fst, (self._snd,)
+
+
+def concat(fst: Iterable[T], snd: Iterable[T]) -> Iterable[T]:
+    if not snd:
+        return fst
+    if not fst:
+        return snd
+    return Chain(fst, snd)
+
+
+def unique(items: Iterable[T]) -> List[T]:
+    return list(dict.fromkeys(items))
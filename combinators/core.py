@@ -1,9 +1,16 @@
 from abc import abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from heapq import nsmallest
+from time import perf_counter
+from types import GeneratorType
 from typing import (
-    Callable, Dict, Generic, List, Literal, Optional, Sequence, Tuple, TypeVar
+    Any, Callable, Dict, FrozenSet, Generator, Generic, Iterable, Iterator,
+    List, Literal, Optional, Sequence, Tuple, TypeVar, Union
 )
 
-from .chain import Chain, ChainL
+from .chain import Chain, ChainL, ChainR, concat
 from .result import (
     Error, Insert, Ok, PrefixItem, Recovered, Repair, Result, Skip
 )
@@ -31,12 +38,368 @@ def maybe_allow_recovery(rm: RecoveryMode, r: Result[V]) -> RecoveryMode:
 
 
 ParseFn = Callable[[Sequence[T], int, RecoveryMode], Result[V]]
+FastFn = Callable[[Sequence[T], int], Optional[Tuple[V, int]]]
+Step = Generator[Any, Result[Any], Result[V]]
+StepFn = Callable[[Sequence[T], int], Union[Result[V], Step[V]]]
+
+KeyFn = Optional[Callable[[Any], object]]
+First = Tuple[FrozenSet[Tuple[KeyFn, object]], bool]
+
+
+class Abort(Exception):
+    def __init__(self, pos: Optional[int] = None):
+        super().__init__(pos)
+        self.pos = pos
+
+
+def run(step: Union[Result[V], Step[V]]) -> Result[V]:
+    if isinstance(step, (Ok, Error, Recovered)):
+        return step
+    stack: List[Step[Any]] = []
+    r: Any = None
+    while True:
+        try:
+            child = step.send(r)
+        except StopIteration as stop:
+            if not stack:
+                return stop.value  # type: ignore
+            r = stop.value
+            step = stack.pop()
+            continue
+        if type(child) is GeneratorType:
+            stack.append(step)
+            step = child
+            r = None
+        else:
+            r = child
+
+
+MemoKey = Tuple[object, int, RecoveryMode]
+
+
+class Memo:
+    __slots__ = "table", "size", "hits", "misses", "stream", "_log", "_marks"
+
+    def __init__(self, size: Optional[int] = None):
+        self.table: Dict[MemoKey, Result[Any]] = {}
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.stream: Optional[Sequence[Any]] = None
+        self._log: List[MemoKey] = []
+        self._marks = 0
+
+    def bind(self, stream: Sequence[Any]) -> "Memo":
+        if self.stream is not stream:
+            self.table.clear()
+            self.hits = 0
+            self.misses = 0
+            self.stream = stream
+        return self
+
+    def apply(
+            self, fn: ParseFn[T, V], stream: Sequence[T], pos: int,
+            rm: RecoveryMode) -> Result[V]:
+        entry = (fn, pos, rm)
+        r = self.table.get(entry)
+        if r is not None:
+            self.hits += 1
+            return r
+        self.misses += 1
+        return self._store(entry, fn(stream, pos, rm))
+
+    def apply_step(
+            self, fn: ParseFn[T, V], step: StepFn[T, V], stream: Sequence[T],
+            pos: int) -> Union[Result[V], Step[V]]:
+        entry = (fn, pos, None)
+        r = self.table.get(entry)
+        if r is not None:
+            self.hits += 1
+            return r
+        self.misses += 1
+        return _then(step(stream, pos), lambda r: self._store(entry, r))
+
+    def _store(self, entry: MemoKey, r: Result[V]) -> Result[V]:
+        if self.size is not None and len(self.table) >= self.size:
+            if not self.table:
+                return r
+            del self.table[next(iter(self.table))]
+        self.table[entry] = r
+        if self._marks:
+            self._log.append(entry)
+        return r
+
+    def mark(self) -> int:
+        self._marks += 1
+        return len(self._log)
+
+    def discard(self, mark: int) -> None:
+        for entry in self._log[mark:]:
+            self.table.pop(entry, None)
+        del self._log[mark:]
+        self._marks -= 1
+
+    def edit(
+            self, stream: Sequence[Any], start: int, end: int,
+            delta: int) -> "Memo":
+        memo = Memo(self.size)
+        memo.stream = stream
+        table = memo.table
+        for (fn, pos, rm), r in self.table.items():
+            if type(r) is not Ok:
+                continue
+            if r.pos < start:
+                table[fn, pos, rm] = r
+            elif pos >= end:
+                table[fn, pos + delta, rm] = Ok(
+                    r.value, r.pos + delta, r.expected, r.consumed
+                )
+        return memo
+
+
+_memo: ContextVar[Optional[Memo]] = ContextVar("memo", default=None)
+
+
+class Recovery:
+    __slots__ = "budget", "beam"
+
+    def __init__(self, budget: int = 64, beam: int = 16):
+        self.budget = budget
+        self.beam = beam
+
+    def prune(self, repairs: Iterable[Repair[V]]) -> List[Repair[V]]:
+        best = nsmallest(self.beam, repairs, key=_rank)
+        if not best:
+            return best
+        limit = _rank(best[0]) + self.budget
+        return [r for r in best if _rank(r) <= limit]
+
+
+def _rank(r: Repair[Any]) -> int:
+    return r.cost - r.pos
+
+
+_recovery: ContextVar[Recovery] = ContextVar("recovery", default=Recovery())
+_anchor: ContextVar[int] = ContextVar("anchor", default=-1)
+_repairs: ContextVar[Optional[Memo]] = ContextVar("repairs", default=None)
+
+
+def _recover_at(
+        fn: ParseFn[T, V], stream: Sequence[T], pos: int) -> Result[V]:
+    table = _repairs.get()
+    if table is None or pos == _anchor.get():
+        return fn(stream, pos, True)
+    return table.apply(fn, stream, pos, True)
+
+
+def _scan(stream: Sequence[T], t: T, start: int, end: int) -> Optional[int]:
+    for cur in range(start, end):
+        if stream[cur] == t:
+            return cur
+    return None
+
+
+class Index(Generic[T]):
+    __slots__ = "_stream", "_positions"
+
+    def __init__(self, stream: Sequence[T]):
+        self._stream = stream
+        self._positions: Optional[Dict[T, List[int]]] = None
+
+    def find(self, t: T, start: int, end: int) -> Optional[int]:
+        if self._positions is None:
+            self._positions = {}
+            try:
+                for i, s in enumerate(self._stream):
+                    self._positions.setdefault(s, []).append(i)
+            except TypeError:
+                self._positions.clear()
+        if not self._positions:
+            return _scan(self._stream, t, start, end)
+        positions = self._positions.get(t)
+        if positions is None:
+            return None
+        i = bisect_left(positions, start)
+        if i < len(positions) and positions[i] < end:
+            return positions[i]
+        return None
+
+
+_index: ContextVar[Optional[Index[Any]]] = ContextVar("index", default=None)
+
+
+class ProfileNode:
+    __slots__ = (
+        "name", "children", "calls", "ok", "failed", "recovered", "consumed",
+        "time", "wasted"
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.children: Dict[str, ProfileNode] = {}
+        self.calls = 0
+        self.ok = 0
+        self.failed = 0
+        self.recovered = 0
+        self.consumed = 0
+        self.time = 0.0
+        self.wasted = 0.0
+
+    def self_time(self) -> float:
+        return self.time - sum(c.time for c in self.children.values())
+
+
+class Profile:
+    __slots__ = "root", "_node"
+
+    def __init__(self) -> None:
+        self.root = ProfileNode("")
+        self._node = self.root
+
+    def call(
+            self, name: str, fn: ParseFn[T, V], stream: Sequence[T], pos: int,
+            rm: RecoveryMode) -> Result[V]:
+        parent = self._node
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = ProfileNode(name)
+        self._node = node
+        start = perf_counter()
+        try:
+            r = fn(stream, pos, rm)
+        finally:
+            elapsed = perf_counter() - start
+            node.time += elapsed
+            self._node = parent
+        return self._record(node, pos, r, elapsed)
+
+    def call_step(
+            self, name: str, step: StepFn[T, V], stream: Sequence[T],
+            pos: int) -> Step[V]:
+        parent = self._node
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = ProfileNode(name)
+        self._node = node
+        start = perf_counter()
+        try:
+            r = yield step(stream, pos)
+        finally:
+            elapsed = perf_counter() - start
+            node.time += elapsed
+            self._node = parent
+        return self._record(node, pos, r, elapsed)
+
+    def _record(
+            self, node: ProfileNode, pos: int, r: Result[V],
+            elapsed: float) -> Result[V]:
+        node.calls += 1
+        if type(r) is Ok:
+            node.ok += 1
+            node.consumed += r.pos - pos
+        elif type(r) is Recovered:
+            node.recovered += 1
+        else:
+            node.failed += 1
+            node.wasted += elapsed
+        return r
+
+    def rules(self) -> List[ProfileNode]:
+        rules: Dict[str, ProfileNode] = {}
+        active: Dict[str, int] = {}
+        stack = [(child, True) for child in _children(self.root)]
+        while stack:
+            node, enter = stack.pop()
+            if not enter:
+                active[node.name] -= 1
+                continue
+            rule = rules.get(node.name)
+            if rule is None:
+                rule = rules[node.name] = ProfileNode(node.name)
+            rule.calls += node.calls
+            rule.ok += node.ok
+            rule.failed += node.failed
+            rule.recovered += node.recovered
+            rule.consumed += node.consumed
+            rule.wasted += node.wasted
+            if not active.get(node.name):
+                rule.time += node.time
+            active[node.name] = active.get(node.name, 0) + 1
+            stack.append((node, False))
+            stack.extend((child, True) for child in _children(node))
+        return sorted(rules.values(), key=lambda r: r.time, reverse=True)
+
+    def report(self) -> str:
+        row = "{:<24} {:>8} {:>8} {:>8} {:>8} {:>9} {:>10} {:>10}"
+        lines = [row.format(
+            "rule", "calls", "ok", "failed", "recov", "consumed", "time, ms",
+            "failed, ms"
+        )]
+        for rule in self.rules():
+            lines.append(row.format(
+                rule.name, rule.calls, rule.ok, rule.failed, rule.recovered,
+                rule.consumed, "{:.2f}".format(rule.time * 1000),
+                "{:.2f}".format(rule.wasted * 1000)
+            ))
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        lines: List[str] = []
+        stack = [(child, "") for child in _children(self.root)]
+        while stack:
+            node, path = stack.pop()
+            path = node.name if not path else path + ";" + node.name
+            lines.append("{} {}".format(
+                path, max(round(node.self_time() * 1e6), 0)
+            ))
+            stack.extend((child, path) for child in _children(node))
+        return "\n".join(lines)
+
+
+def _children(node: ProfileNode) -> List[ProfileNode]:
+    return list(reversed(node.children.values()))
+
+
+_profile: ContextVar[Optional[Profile]] = ContextVar("profile", default=None)
+
+
+@contextmanager
+def _parse_context(
+        stream: Sequence[T], recover: Union[bool, Recovery],
+        memo: Union[bool, Memo], profile: Optional[Profile]) -> Iterator[None]:
+    recovery = (
+        _recovery.set(recover) if isinstance(recover, Recovery) else None
+    )
+    index = _index.set(Index(stream)) if recover else None
+    repairs = _repairs.set(Memo()) if recover else None
+    table = _memo.set(
+        Memo() if memo is True else memo.bind(stream)
+    ) if memo else None
+    prof = _profile.set(profile) if profile is not None else None
+    try:
+        yield
+    finally:
+        if prof is not None:
+            _profile.reset(prof)
+        if table is not None:
+            _memo.reset(table)
+        if repairs is not None:
+            _repairs.reset(repairs)
+        if index is not None:
+            _index.reset(index)
+        if recovery is not None:
+            _recovery.reset(recovery)
 
 
 class Parser(Generic[T, V_co]):
     def parse(
-            self, stream: Sequence[T], recover: bool = False) -> Result[V_co]:
-        return self.parse_fn(stream, 0, True if recover else None)
+            self, stream: Sequence[T], recover: Union[bool, Recovery] = False,
+            memo: Union[bool, Memo] = False,
+            profile: Optional[Profile] = None) -> Result[V_co]:
+        if not recover and memo is False and profile is None:
+            return self.parse_fn(stream, 0, None)
+        with _parse_context(stream, recover, memo, profile):
+            return self.parse_fn(stream, 0, True if recover else None)
 
     @abstractmethod
     def parse_fn(
@@ -47,13 +410,23 @@ class Parser(Generic[T, V_co]):
     def to_fn(self) -> ParseFn[T, V_co]:
         return self.parse_fn
 
-    def fmap(self, fn: Callable[[V_co], U]) -> "Parser[T, U]":
-        self_fn = self.to_fn()
+    def fast_fn(self) -> FastFn[T, V_co]:
+        return _to_fast(self.to_fn())
+
+    def step_fn(self) -> StepFn[T, V_co]:
+        return _to_step(self.to_fn())
 
-        def fmap(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[U]:
-            return self_fn(stream, pos, rm).fmap(fn)
+    def deep(self) -> bool:
+        return False
 
-        return FnParser(fmap)
+    def compile(self) -> "Parser[T, V_co]":
+        return Compiled(self)
+
+    def first(self) -> Optional[First]:
+        return None
+
+    def fmap(self, fn: Callable[[V_co], U]) -> "Parser[T, U]":
+        return Fmap(self, fn)
 
     def bind(self, fn: Callable[[V_co], "Parser[T, U]"]) -> "Parser[T, U]":
         return bind(self, fn)
@@ -68,37 +441,7 @@ class Parser(Generic[T, V_co]):
         return seq(self, other)
 
     def __or__(self, other: "Parser[T, V_co]") -> "Parser[T, V_co]":
-        self_fn = self.to_fn()
-        other_fn = other.to_fn()
-
-        def or_(
-                stream: Sequence[T], pos: int,
-                rm: RecoveryMode) -> Result[V_co]:
-            ra = self_fn(stream, pos, disallow_recovery(rm))
-            if ra.consumed is True:
-                return ra
-            rb = other_fn(stream, pos, disallow_recovery(rm))
-            if rb.consumed is True:
-                return rb
-            expected = Chain(ra.expected, rb.expected)
-            if type(ra) is Ok:
-                return ra.expect(expected)
-            if type(rb) is Ok:
-                return rb.expect(expected)
-            if rm:
-                ra = self_fn(stream, pos, True)
-                rb = other_fn(stream, pos, True)
-                if type(ra) is Recovered:
-                    if type(rb) is Recovered:
-                        reps = {pb.pos: pb for pb in rb.repairs}
-                        reps.update((pa.pos, pa) for pa in ra.repairs)
-                        return Recovered(list(reps.values()))
-                    return ra.expect(expected)
-                if type(rb) is Recovered:
-                    return rb.expect(expected)
-            return Error(pos, expected)
-
-        return FnParser(or_)
+        return Alt(self, other)
 
     def maybe(self) -> "Parser[T, Optional[V_co]]":
         return maybe(self)
@@ -109,6 +452,9 @@ class Parser(Generic[T, V_co]):
     def label(self, expected: str) -> "Parser[T, V_co]":
         return label(self, expected)
 
+    def memo(self) -> "Parser[T, V_co]":
+        return memo(self)
+
     def sep_by(self, sep: "Parser[T, U]") -> "Parser[T, List[V_co]]":
         return sep_by(self, sep)
 
@@ -118,9 +464,39 @@ class Parser(Generic[T, V_co]):
         return between(open, close, self)
 
 
+def _to_fast(fn: ParseFn[T, V]) -> FastFn[T, V]:
+    return lambda stream, pos: _fast_result(fn(stream, pos, None))
+
+
+def _fast_result(r: Result[V]) -> Optional[Tuple[V, int]]:
+    if type(r) is Ok:
+        return r.value, r.pos
+    if r.consumed:
+        raise Abort()
+    return None
+
+
+def _to_step(fn: ParseFn[T, V]) -> StepFn[T, V]:
+    return lambda stream, pos: fn(stream, pos, None)
+
+
+def _then(
+        r: Union[Result[V], Step[V]],
+        fn: Callable[[Result[V]], Result[U]]) -> Union[Result[U], Step[U]]:
+    if isinstance(r, (Ok, Error, Recovered)):
+        return fn(r)
+    return _then_step(r, fn)
+
+
+def _then_step(step: Step[V], fn: Callable[[Result[V]], Result[U]]) -> Step[U]:
+    return fn((yield step))
+
+
 class FnParser(Parser[T, V_co]):
     def __init__(self, fn: ParseFn[T, V_co]):
         self._fn = fn
+        self._fast: Optional[FastFn[T, V_co]] = None
+        self._step: Optional[StepFn[T, V_co]] = None
 
     def to_fn(self) -> ParseFn[T, V_co]:
         return self._fn
@@ -130,13 +506,333 @@ class FnParser(Parser[T, V_co]):
             rm: RecoveryMode) -> Result[V_co]:
         return self._fn(stream, pos, rm)
 
+    def fast_fn(self) -> FastFn[T, V_co]:
+        if self._fast is None:
+            self._fast = self.make_fast()
+        return self._fast
+
+    def make_fast(self) -> FastFn[T, V_co]:
+        return _to_fast(self._fn)
+
+    def step_fn(self) -> StepFn[T, V_co]:
+        if self._step is None:
+            self._step = (
+                self.make_step() if self.deep() else _to_step(self._fn)
+            )
+        return self._step
+
+    def make_step(self) -> StepFn[T, V_co]:
+        return _to_step(self._fn)
+
+
+class Compiled(Parser[T, V_co]):
+    def __init__(self, parser: Parser[T, V_co]):
+        self._parser = parser
+        self._fn = parser.to_fn()
+        self._fast: Optional[FastFn[T, V_co]] = None
+
+    def parse(
+            self, stream: Sequence[T], recover: Union[bool, Recovery] = False,
+            memo: Union[bool, Memo] = False,
+            profile: Optional[Profile] = None) -> Result[V_co]:
+        if recover or memo is not False or profile is not None:
+            return self._parser.parse(stream, recover, memo, profile)
+        try:
+            r = self.fast_fn()(stream, 0)
+        except Abort:
+            r = None
+        if r is None:
+            return self._parser.parse(stream)
+        return Ok(r[0], r[1], consumed=r[1] > 0)
+
+    def parse_fn(
+            self, stream: Sequence[T], pos: int,
+            rm: RecoveryMode) -> Result[V_co]:
+        return self._fn(stream, pos, rm)
+
+    def to_fn(self) -> ParseFn[T, V_co]:
+        return self._fn
+
+    def fast_fn(self) -> FastFn[T, V_co]:
+        if self._fast is None:
+            self._fast = self._parser.fast_fn()
+        return self._fast
+
+    def step_fn(self) -> StepFn[T, V_co]:
+        return self._parser.step_fn()
+
+    def deep(self) -> bool:
+        return self._parser.deep()
+
+    def first(self) -> Optional[First]:
+        return self._parser.first()
+
+
+class Fmap(FnParser[T, V_co]):
+    def __init__(self, parser: Parser[T, U], fn: Callable[[U], V_co]):
+        parser_fn = parser.to_fn()
+
+        def fmap(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V_co]:
+            return parser_fn(stream, pos, rm).fmap(fn)
+
+        super().__init__(fmap)
+        self._parser = parser
+        self._map = fn
+
+    def first(self) -> Optional[First]:
+        return self._parser.first()
+
+    def make_fast(self) -> FastFn[T, V_co]:
+        parser_fast = self._parser.fast_fn()
+        fn = self._map
+
+        def fmap(stream: Sequence[T], pos: int) -> Optional[Tuple[V_co, int]]:
+            r = parser_fast(stream, pos)
+            if r is None:
+                return None
+            return fn(r[0]), r[1]
+
+        return fmap
+
+    def deep(self) -> bool:
+        return self._parser.deep()
+
+    def make_step(self) -> StepFn[T, V_co]:
+        parser_step = self._parser.step_fn()
+        fn = self._map
+
+        def apply(r: Result[Any]) -> Result[V_co]:
+            return r.fmap(fn)
+
+        return lambda stream, pos: _then(parser_step(stream, pos), apply)
+
+
+Dispatch = List[Tuple[KeyFn, Dict[object, List[int]]]]
+
+
+def _dispatch_table(branches: Sequence[Parser[T, V]]) -> Optional[Dispatch]:
+    groups: Dict[KeyFn, Dict[object, List[int]]] = {}
+    for i, branch in enumerate(branches):
+        first = branch.first()
+        if first is None or first[1]:
+            return None
+        for key_fn, key in first[0]:
+            groups.setdefault(key_fn, {}).setdefault(key, []).append(i)
+    return list(groups.items())
+
+
+def _candidates(table: Dispatch, t: object) -> Optional[List[int]]:
+    try:
+        if len(table) == 1:
+            key_fn, keys = table[0]
+            return keys.get(t if key_fn is None else key_fn(t), [])
+        candidates: List[int] = []
+        for key_fn, keys in table:
+            candidates.extend(
+                keys.get(t if key_fn is None else key_fn(t), ())
+            )
+    except TypeError:
+        return None
+    return sorted(set(candidates))
+
+
+class LazyExpected(Iterable[str]):
+    __slots__ = "_fn", "_stream", "_pos", "_rm", "_expected"
+
+    def __init__(
+            self, fn: ParseFn[T, V], stream: Sequence[T], pos: int,
+            rm: RecoveryMode):
+        self._fn: ParseFn[Any, Any] = fn
+        self._stream: Sequence[Any] = stream
+        self._pos = pos
+        self._rm = rm
+        self._expected: Optional[List[str]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        if self._expected is None:
+            r = self._fn(self._stream, self._pos, self._rm)
+            self._expected = [] if type(r) is Recovered else list(r.expected)
+        return iter(self._expected)
+
+
+class Alt(FnParser[T, V_co]):
+    def __init__(self, parser: Parser[T, V_co], other: Parser[T, V_co]):
+        self_fn: ParseFn[T, V_co] = (
+            parser._fold if isinstance(parser, Alt) else parser.to_fn()
+        )
+        other_fn: ParseFn[T, V_co] = (
+            other._fold if isinstance(other, Alt) else other.to_fn()
+        )
+        branches: List[Parser[T, V_co]] = [
+            *(parser._branches if isinstance(parser, Alt) else [parser]),
+            *(other._branches if isinstance(other, Alt) else [other])
+        ]
+        fns = [branch.to_fn() for branch in branches]
+        table: Union[None, Literal[False], Dispatch] = None
+
+        def fold(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V_co]:
+            ra = self_fn(stream, pos, disallow_recovery(rm))
+            if ra.consumed is True:
+                return ra
+            rb = other_fn(stream, pos, disallow_recovery(rm))
+            if rb.consumed is True:
+                return rb
+            expected = concat(ra.expected, rb.expected)
+            if type(ra) is Ok:
+                return ra.expect(expected)
+            if type(rb) is Ok:
+                return rb.expect(expected)
+            if rm:
+                token = _anchor.set(pos)
+                try:
+                    ra = _recover_at(self_fn, stream, pos)
+                    rb = _recover_at(other_fn, stream, pos)
+                finally:
+                    _anchor.reset(token)
+                if type(ra) is Recovered:
+                    if type(rb) is Recovered:
+                        reps = {pb.pos: pb for pb in rb.repairs}
+                        reps.update((pa.pos, pa) for pa in ra.repairs)
+                        return Recovered(
+                            _recovery.get().prune(reps.values())
+                        )
+                    return ra.expect(expected)
+                if type(rb) is Recovered:
+                    return rb.expect(expected)
+            return Error(pos, expected)
+
+        def or_(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V_co]:
+            nonlocal table
+            if rm or pos >= len(stream):
+                return fold(stream, pos, rm)
+            if table is None:
+                table = _dispatch_table(branches) or False
+            if table is False:
+                return fold(stream, pos, rm)
+            candidates = _candidates(table, stream[pos])
+            if candidates is None:
+                return fold(stream, pos, rm)
+            for i in candidates:
+                r = fns[i](stream, pos, rm)
+                if r.consumed is True:
+                    return r
+            return Error(pos, LazyExpected(fold, stream, pos, rm))
+
+        super().__init__(or_)
+        self._parser = parser
+        self._other = other
+        self._branches: List[Parser[T, V_co]] = branches
+        self._fold: ParseFn[T, V_co] = fold
+
+    def make_fast(self) -> FastFn[T, V_co]:
+        self_fast = self._parser.fast_fn()
+        other_fast = self._other.fast_fn()
+
+        def or_(stream: Sequence[T], pos: int) -> Optional[Tuple[V_co, int]]:
+            ra = self_fast(stream, pos)
+            if ra is not None and ra[1] != pos:
+                return ra
+            rb = other_fast(stream, pos)
+            if ra is None or rb is not None and rb[1] != pos:
+                return rb
+            return ra
+
+        table = _dispatch_table(self._branches)
+        if table is not None:
+            fns: List[FastFn[T, V_co]] = [
+                branch.fast_fn() for branch in self._branches
+            ]
+
+            def dispatch(
+                    stream: Sequence[T],
+                    pos: int) -> Optional[Tuple[V_co, int]]:
+                if pos >= len(stream):
+                    return None
+                candidates = _candidates(table, stream[pos])
+                if candidates is None:
+                    return or_(stream, pos)
+                for i in candidates:
+                    r = fns[i](stream, pos)
+                    if r is not None:
+                        return r
+                return None
+
+            return dispatch
+
+        return or_
+
+    def deep(self) -> bool:
+        return any(branch.deep() for branch in self._branches)
+
+    def make_step(self) -> StepFn[T, V_co]:
+        steps = [branch.step_fn() for branch in self._branches]
+        table = _dispatch_table(self._branches)
+
+        def fold(stream: Sequence[T], pos: int) -> Step[V_co]:
+            expected: Iterable[str] = ()
+            ok: Optional[Ok[V_co]] = None
+            for step in steps:
+                r = yield step(stream, pos)
+                if r.consumed is True:
+                    return r
+                expected = concat(expected, r.expected)
+                if ok is None and type(r) is Ok:
+                    ok = r
+            if ok is not None:
+                return ok.expect(expected)
+            return Error(pos, expected)
+
+        def expect(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V_co]:
+            return run(fold(stream, pos))
+
+        def dispatch(
+                stream: Sequence[T], pos: int,
+                candidates: List[int]) -> Step[V_co]:
+            for i in candidates:
+                r = yield steps[i](stream, pos)
+                if r.consumed is True:
+                    return r
+            return Error(pos, LazyExpected(expect, stream, pos, None))
+
+        def or_(
+                stream: Sequence[T],
+                pos: int) -> Union[Result[V_co], Step[V_co]]:
+            if table is None or pos >= len(stream):
+                return fold(stream, pos)
+            candidates = _candidates(table, stream[pos])
+            if candidates is None:
+                return fold(stream, pos)
+            if len(candidates) == 1:
+                return steps[candidates[0]](stream, pos)
+            if not candidates:
+                return Error(pos, LazyExpected(expect, stream, pos, None))
+            return dispatch(stream, pos, candidates)
+
+        return or_
+
+    def first(self) -> Optional[First]:
+        fa = self._parser.first()
+        fb = self._other.first()
+        if fa is None or fb is None:
+            return None
+        return fa[0] | fb[0], fa[1] or fb[1]
+
 
 def _continue_parse(
         stream: Sequence[T], ra: Recovered[V],
         parse: Callable[[Sequence[T], Repair[V]], Result[U]],
         merge: Callable[[V, U], X]) -> Result[X]:
+    recovery = _recovery.get()
     reps: Dict[int, Repair[X]] = {}
-    for pa in ra.repairs:
+    for pa in recovery.prune(ra.repairs):
         rb = parse(stream, pa)
         if type(rb) is Ok:
             if rb.pos not in reps or pa.cost < reps[rb.pos].cost:
@@ -156,63 +852,176 @@ def _continue_parse(
                             ChainL(PrefixItem(pa.op, pa.expected), pb.prefix)
                         )
                     )
-    if reps:
-        return Recovered(list(reps.values()))
+    repairs = recovery.prune(reps.values())
+    if repairs:
+        return Recovered(repairs)
     return ra.to_error()
 
 
-def bind(
-        parser: Parser[T, V], fn: Callable[[V], Parser[T, U]]) -> Parser[T, U]:
-    parser_fn = parser.to_fn()
+class Bind(FnParser[T, V]):
+    def __init__(
+            self, parser: Parser[T, U], fn: Callable[[U], Parser[T, V]]):
+        parser_fn = parser.to_fn()
 
-    def bind(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[U]:
-        ra = parser_fn(stream, pos, rm)
-        if type(ra) is Error:
-            return ra
-        if type(ra) is Recovered:
-            return _continue_parse(
-                stream, ra, lambda s, p: fn(p.value).parse_fn(s, p.pos, True),
-                lambda _, v: v
-            )
-        return fn(ra.value).parse_fn(
-            stream, ra.pos, maybe_allow_recovery(rm, ra)
-        ).merge_expected(ra.expected, ra.consumed)
+        def bind(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V]:
+            ra = parser_fn(stream, pos, rm)
+            if type(ra) is Error:
+                return ra
+            if type(ra) is Recovered:
+                return _continue_parse(
+                    stream, ra,
+                    lambda s, p: fn(p.value).parse_fn(s, p.pos, True),
+                    lambda _, v: v
+                )
+            return fn(ra.value).parse_fn(
+                stream, ra.pos, maybe_allow_recovery(rm, ra)
+            ).merge_expected(ra.expected, ra.consumed)
+
+        super().__init__(bind)
+        self._parser = parser
+        self._bind = fn
+
+    def first(self) -> Optional[First]:
+        first = self._parser.first()
+        if first is None or first[1]:
+            return None
+        return first
+
+    def make_fast(self) -> FastFn[T, V]:
+        parser_fast = self._parser.fast_fn()
+        fn = self._bind
+
+        def bind(stream: Sequence[T], pos: int) -> Optional[Tuple[V, int]]:
+            ra = parser_fast(stream, pos)
+            if ra is None:
+                return None
+            rb = fn(ra[0]).parse_fn(stream, ra[1], None)
+            if type(rb) is Ok:
+                return rb.value, rb.pos
+            if rb.consumed or ra[1] != pos:
+                raise Abort()
+            return None
 
-    return FnParser(bind)
+        return bind
 
+    def deep(self) -> bool:
+        return True
 
-def _make_seq(
-        parser: Parser[T, V], second: Parser[T, U],
-        fn: Callable[[V, U], X]) -> Parser[T, X]:
-    parser_fn = parser.to_fn()
-    second_fn = second.to_fn()
+    def make_step(self) -> StepFn[T, V]:
+        parser_step = self._parser.step_fn()
+        fn = self._bind
 
-    def seq(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[X]:
-        ra = parser_fn(stream, pos, rm)
-        if type(ra) is Error:
-            return ra
-        if type(ra) is Recovered:
-            return _continue_parse(
-                stream, ra, lambda s, p: second_fn(s, p.pos, True), fn
-            )
-        va = ra.value
-        return second_fn(stream, ra.pos, maybe_allow_recovery(rm, ra)).fmap(
-            lambda vb: fn(va, vb)
-        ).merge_expected(ra.expected, ra.consumed)
+        def bind(stream: Sequence[T], pos: int) -> Step[V]:
+            ra = yield parser_step(stream, pos)
+            if type(ra) is not Ok:
+                return ra
+            rb = yield fn(ra.value).step_fn()(stream, ra.pos)
+            return rb.merge_expected(ra.expected, ra.consumed)
 
-    return FnParser(seq)
+        return bind
+
+
+bind = Bind
+
+
+class Seq(FnParser[T, X]):
+    def __init__(
+            self, parser: Parser[T, V], second: Parser[T, U],
+            fn: Callable[[V, U], X]):
+        parser_fn = parser.to_fn()
+        second_fn = second.to_fn()
+
+        def seq(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[X]:
+            ra = parser_fn(stream, pos, rm)
+            if type(ra) is Error:
+                return ra
+            if type(ra) is Recovered:
+                return _continue_parse(
+                    stream, ra, lambda s, p: _recover_at(second_fn, s, p.pos),
+                    fn
+                )
+            rb = second_fn(stream, ra.pos, maybe_allow_recovery(rm, ra))
+            if type(rb) is Ok:
+                return Ok(
+                    fn(ra.value, rb.value), rb.pos,
+                    rb.expected if ra.consumed and rb.consumed
+                    else concat(ra.expected, rb.expected),
+                    ra.consumed or rb.consumed
+                )
+            va = ra.value
+            return rb.fmap(
+                lambda vb: fn(va, vb)
+            ).merge_expected(ra.expected, ra.consumed)
+
+        super().__init__(seq)
+        self._parser = parser
+        self._second = second
+        self._merge = fn
+
+    def first(self) -> Optional[First]:
+        fa = self._parser.first()
+        if fa is None or not fa[1]:
+            return fa
+        fb = self._second.first()
+        if fb is None:
+            return None
+        return fa[0] | fb[0], fb[1]
+
+    def make_fast(self) -> FastFn[T, X]:
+        parser_fast = self._parser.fast_fn()
+        second_fast = self._second.fast_fn()
+        fn = self._merge
+
+        def seq(stream: Sequence[T], pos: int) -> Optional[Tuple[X, int]]:
+            ra = parser_fast(stream, pos)
+            if ra is None:
+                return None
+            rb = second_fast(stream, ra[1])
+            if rb is None:
+                if ra[1] != pos:
+                    raise Abort(ra[1])
+                return None
+            return fn(ra[0], rb[0]), rb[1]
+
+        return seq
+
+    def deep(self) -> bool:
+        return self._parser.deep() or self._second.deep()
+
+    def make_step(self) -> StepFn[T, X]:
+        parser_step = self._parser.step_fn()
+        second_step = self._second.step_fn()
+        fn = self._merge
+
+        def seq(stream: Sequence[T], pos: int) -> Step[X]:
+            ra = yield parser_step(stream, pos)
+            if type(ra) is not Ok:
+                return ra
+            rb = yield second_step(stream, ra.pos)
+            if type(rb) is Ok:
+                return Ok(
+                    fn(ra.value, rb.value), rb.pos,
+                    rb.expected if ra.consumed and rb.consumed
+                    else concat(ra.expected, rb.expected),
+                    ra.consumed or rb.consumed
+                )
+            return rb.merge_expected(ra.expected, ra.consumed)
+
+        return seq
 
 
 def lseq(parser: Parser[T, V], second: Parser[T, U]) -> Parser[T, V]:
-    return _make_seq(parser, second, lambda l, _: l)
+    return Seq(parser, second, lambda l, _: l)
 
 
 def rseq(parser: Parser[T, V], second: Parser[T, U]) -> Parser[T, U]:
-    return _make_seq(parser, second, lambda _, r: r)
+    return Seq(parser, second, lambda _, r: r)
 
 
 def seq(parser: Parser[T, V], second: Parser[T, U]) -> Parser[T, Tuple[V, U]]:
-    return _make_seq(parser, second, lambda l, r: (l, r))
+    return Seq(parser, second, lambda l, r: (l, r))
 
 
 class Pure(Parser[T, V_co]):
@@ -224,6 +1033,13 @@ class Pure(Parser[T, V_co]):
             rm: RecoveryMode) -> Result[V_co]:
         return Ok(self._x, pos)
 
+    def fast_fn(self) -> FastFn[T, V_co]:
+        x = self._x
+        return lambda stream, pos: (x, pos)
+
+    def first(self) -> Optional[First]:
+        return frozenset(), True
+
 
 pure = Pure
 
@@ -237,6 +1053,13 @@ class PureFn(Parser[T, V_co]):
             rm: RecoveryMode) -> Result[V_co]:
         return Ok(self._fn(), pos)
 
+    def fast_fn(self) -> FastFn[T, V_co]:
+        fn = self._fn
+        return lambda stream, pos: (fn(), pos)
+
+    def first(self) -> Optional[First]:
+        return frozenset(), True
+
 
 pure_fn = PureFn
 
@@ -254,109 +1077,378 @@ class Eof(Parser[T, None]):
             )])
         return Error(pos, ["end of file"])
 
+    def fast_fn(self) -> FastFn[T, None]:
+        def eof(stream: Sequence[T], pos: int) -> Optional[Tuple[None, int]]:
+            if pos == len(stream):
+                return None, pos
+            return None
+
+        return eof
+
 
 eof = Eof
 
 
-def satisfy(test: Callable[[T], bool]) -> Parser[T, T]:
-    def satisfy(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[T]:
-        if pos < len(stream):
-            t = stream[pos]
-            if test(t):
-                return Ok(t, pos + 1, consumed=True)
-        if rm:
-            cur = pos + 1
-            while cur < len(stream):
-                t = stream[cur]
+class Satisfy(FnParser[T, T]):
+    def __init__(
+            self, test: Callable[[T], bool],
+            key: Optional[Callable[[T], object]] = None,
+            keys: Iterable[object] = ()):
+        def satisfy(
+                stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[T]:
+            if pos < len(stream):
+                t = stream[pos]
                 if test(t):
-                    skip = cur - pos
-                    Recovered([Repair(skip, t, cur + 1, Skip(skip, pos))])
-                cur += 1
-        return Error(pos)
+                    return Ok(t, pos + 1, consumed=True)
+            return Error(pos)
 
-    return FnParser(satisfy)
+        super().__init__(satisfy)
+        self._test = test
+        self._key = key
+        self._keys = frozenset(keys)
 
+    def make_fast(self) -> FastFn[T, T]:
+        test = self._test
 
-def sym(s: T) -> Parser[T, T]:
-    rs = repr(s)
-    expected = [rs]
+        def satisfy(stream: Sequence[T], pos: int) -> Optional[Tuple[T, int]]:
+            if pos < len(stream):
+                t = stream[pos]
+                if test(t):
+                    return t, pos + 1
+            return None
 
-    def sym(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[T]:
-        if pos < len(stream):
-            t = stream[pos]
-            if t == s:
-                return Ok(t, pos + 1, consumed=True)
-        if rm:
-            ins = Repair(1, s, pos, Insert(rs, pos), expected)
-            cur = pos + 1
-            while cur < len(stream):
-                t = stream[cur]
+        return satisfy
+
+    def first(self) -> Optional[First]:
+        if self._key is None:
+            return None
+        key = self._key
+        return frozenset((key, k) for k in self._keys), False
+
+
+satisfy = Satisfy
+
+
+class Sym(FnParser[T, T]):
+    def __init__(self, s: T):
+        rs = repr(s)
+        expected = [rs]
+        try:
+            hash(s)
+            hashable = True
+        except TypeError:
+            hashable = False
+
+        def sym(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[T]:
+            if pos < len(stream):
+                t = stream[pos]
                 if t == s:
-                    skip = cur - pos
+                    return Ok(t, pos + 1, consumed=True)
+            if rm:
+                ins = Repair(1, s, pos, Insert(rs, pos), expected)
+                if pos == _anchor.get():
+                    return Recovered([ins])
+                end = min(len(stream), pos + _recovery.get().budget + 1)
+                index = _index.get() if hashable else None
+                if index is not None:
+                    found = index.find(s, pos + 1, end)
+                else:
+                    found = _scan(stream, s, pos + 1, end)
+                if found is not None:
+                    skip = found - pos
                     return Recovered([
                         ins,
-                        Repair(skip, t, cur + 1, Skip(skip, pos), expected)
+                        Repair(
+                            skip, stream[found], found + 1, Skip(skip, pos),
+                            expected
+                        )
                     ])
-                cur += 1
-            return Recovered([ins])
-        return Error(pos, expected)
+                return Recovered([ins])
+            return Error(pos, expected)
 
-    return FnParser(sym)
+        super().__init__(sym)
+        self._s = s
+        self._hashable = hashable
 
+    def make_fast(self) -> FastFn[T, T]:
+        s = self._s
 
-def maybe(parser: Parser[T, V]) -> Parser[T, Optional[V]]:
-    fn = parser.to_fn()
+        def sym(stream: Sequence[T], pos: int) -> Optional[Tuple[T, int]]:
+            if pos < len(stream):
+                t = stream[pos]
+                if t == s:
+                    return t, pos + 1
+            return None
 
-    def maybe(
-            stream: Sequence[T], pos: int,
-            rm: RecoveryMode) -> Result[Optional[V]]:
-        r = fn(stream, pos, disallow_recovery(rm))
-        if r.consumed is True or type(r) is Ok:
-            return r
-        return Ok(None, pos, r.expected)
+        return sym
 
-    return FnParser(maybe)
+    def first(self) -> Optional[First]:
+        if not self._hashable:
+            return None
+        return frozenset([(None, self._s)]), False
 
 
-def many(parser: Parser[T, V]) -> Parser[T, List[V]]:
-    fn = parser.to_fn()
+sym = Sym
 
-    def many(
-            stream: Sequence[T], pos: int,
-            rm: RecoveryMode) -> Result[List[V]]:
-        rm = disallow_recovery(rm)
-        consumed = False
-        value: List[V] = []
-        r = fn(stream, pos, rm)
-        while type(r) is Ok:
-            consumed |= r.consumed
-            value.append(r.value)
-            r = fn(stream, r.pos, rm)
-        if type(r) is Recovered:
-            return _continue_parse(
-                stream, r, parse, lambda a, b: [*value, a, *b]
-            )
-        if r.consumed:
+
+class Maybe(FnParser[T, Optional[V]]):
+    def __init__(self, parser: Parser[T, V]):
+        fn = parser.to_fn()
+
+        def maybe(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[Optional[V]]:
+            r = fn(stream, pos, disallow_recovery(rm))
+            if r.consumed is True or type(r) is Ok:
+                return r
+            return Ok(None, pos, r.expected)
+
+        super().__init__(maybe)
+        self._parser = parser
+
+    def make_fast(self) -> FastFn[T, Optional[V]]:
+        fast = self._parser.fast_fn()
+
+        def maybe(
+                stream: Sequence[T],
+                pos: int) -> Optional[Tuple[Optional[V], int]]:
+            r = fast(stream, pos)
+            if r is None:
+                return None, pos
             return r
-        return Ok(value, r.pos, r.expected, consumed)
 
-    def parse(stream: Sequence[T], p: Repair[V]) -> Result[List[V]]:
-        r = many(stream, p.pos, True)
-        if type(r) is Error and r.consumed is False:
-            return Ok[List[V]]([], r.pos, r.expected)
-        return r
+        return maybe
+
+    def deep(self) -> bool:
+        return self._parser.deep()
+
+    def make_step(self) -> StepFn[T, Optional[V]]:
+        step = self._parser.step_fn()
+
+        def maybe(stream: Sequence[T], pos: int) -> Step[Optional[V]]:
+            r = yield step(stream, pos)
+            if r.consumed is True or type(r) is Ok:
+                return r
+            return Ok(None, pos, r.expected)
+
+        return maybe
+
+    def first(self) -> Optional[First]:
+        first = self._parser.first()
+        if first is None:
+            return None
+        return first[0], True
+
+
+maybe = Maybe
+
+
+class Many(FnParser[T, List[V]]):
+    def __init__(self, parser: Parser[T, V]):
+        fn = parser.to_fn()
+
+        def many(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[List[V]]:
+            rm = disallow_recovery(rm)
+            consumed = False
+            value: List[V] = []
+            r = fn(stream, pos, rm)
+            while type(r) is Ok:
+                consumed |= r.consumed
+                value.append(r.value)
+                r = fn(stream, r.pos, rm)
+            if type(r) is Recovered:
+                return recover(stream, r, value)
+            if r.consumed:
+                return r
+            return Ok(value, r.pos, r.expected, consumed)
+
+        def recover(
+                stream: Sequence[T], r: Recovered[V],
+                value: List[V]) -> Result[List[V]]:
+            recovery = _recovery.get()
+            done: Dict[int, Repair[Iterable[V]]] = {}
+            states: List[Repair[Iterable[V]]] = [
+                Repair(
+                    p.cost, ChainR(value, p.value), p.pos, p.op, p.expected,
+                    p.consumed, p.prefix
+                )
+                for p in r.repairs
+            ]
+            while states:
+                reps: Dict[int, Repair[Iterable[V]]] = {}
+                for pa in recovery.prune(states):
+                    items: List[V] = []
+                    rb = fn(stream, pa.pos, False)
+                    while type(rb) is Ok:
+                        items.append(rb.value)
+                        rb = fn(stream, rb.pos, False)
+                    acc = concat(pa.value, items)
+                    if type(rb) is Recovered:
+                        for pb in rb.repairs:
+                            cost = pa.cost + pb.cost
+                            if pb.pos not in reps or cost < reps[pb.pos].cost:
+                                reps[pb.pos] = Repair(
+                                    cost, ChainR(acc, pb.value), pb.pos,
+                                    pb.op, pb.expected, True,
+                                    Chain(pa.prefix, ChainL(
+                                        PrefixItem(pa.op, pa.expected),
+                                        pb.prefix
+                                    ))
+                                )
+                    elif not rb.consumed and (
+                            rb.pos not in done
+                            or pa.cost < done[rb.pos].cost):
+                        done[rb.pos] = Repair(
+                            pa.cost, acc, rb.pos, pa.op, pa.expected,
+                            pa.consumed, pa.prefix
+                        )
+                states = list(reps.values())
+            repairs = recovery.prune(done.values())
+            if repairs:
+                return Recovered(repairs).fmap(list)
+            return r.to_error()
+
+        super().__init__(many)
+        self._parser = parser
+
+    def make_fast(self) -> FastFn[T, List[V]]:
+        fast = self._parser.fast_fn()
+
+        def many(
+                stream: Sequence[T],
+                pos: int) -> Optional[Tuple[List[V], int]]:
+            value: List[V] = []
+            r = fast(stream, pos)
+            while r is not None:
+                value.append(r[0])
+                pos = r[1]
+                r = fast(stream, pos)
+            return value, pos
+
+        return many
+
+    def deep(self) -> bool:
+        return self._parser.deep()
+
+    def make_step(self) -> StepFn[T, List[V]]:
+        step = self._parser.step_fn()
+
+        def many(stream: Sequence[T], pos: int) -> Step[List[V]]:
+            consumed = False
+            value: List[V] = []
+            r = yield step(stream, pos)
+            while type(r) is Ok:
+                consumed |= r.consumed
+                value.append(r.value)
+                r = yield step(stream, r.pos)
+            if r.consumed:
+                return r
+            return Ok(value, r.pos, r.expected, consumed)
+
+        return many
+
+    def first(self) -> Optional[First]:
+        first = self._parser.first()
+        if first is None:
+            return None
+        return first[0], True
+
+
+many = Many
+
+
+class Label(FnParser[T, V_co]):
+    def __init__(self, parser: Parser[T, V_co], x: str):
+        fn = parser.to_fn()
+        expected = [x]
+
+        def label(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V_co]:
+            profile = _profile.get()
+            if profile is not None:
+                return profile.call(x, fn, stream, pos, rm).expect(expected)
+            return fn(stream, pos, rm).expect(expected)
+
+        super().__init__(label)
+        self._parser = parser
+        self._label = x
+
+    def make_fast(self) -> FastFn[T, V_co]:
+        return self._parser.fast_fn()
+
+    def deep(self) -> bool:
+        return self._parser.deep()
+
+    def make_step(self) -> StepFn[T, V_co]:
+        step = self._parser.step_fn()
+        expected = [self._label]
+
+        def apply(r: Result[V_co]) -> Result[V_co]:
+            return r.expect(expected)
+
+        def label(
+                stream: Sequence[T],
+                pos: int) -> Union[Result[V_co], Step[V_co]]:
+            profile = _profile.get()
+            if profile is not None:
+                return _then(
+                    profile.call_step(self._label, step, stream, pos), apply
+                )
+            return _then(step(stream, pos), apply)
+
+        return label
+
+    def first(self) -> Optional[First]:
+        return self._parser.first()
+
+
+label = Label
+
+
+class MemoParser(FnParser[T, V_co]):
+    def __init__(self, parser: Parser[T, V_co]):
+        fn = parser.to_fn()
+
+        def memo(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V_co]:
+            table = _memo.get()
+            if table is None:
+                return fn(stream, pos, rm)
+            return table.apply(fn, stream, pos, rm)
+
+        super().__init__(memo)
+        self._parser = parser
+        self._key = fn
 
-    return FnParser(many)
+    def make_fast(self) -> FastFn[T, V_co]:
+        return self._parser.fast_fn()
 
+    def deep(self) -> bool:
+        return self._parser.deep()
 
-def label(parser: Parser[T, V], x: str) -> Parser[T, V]:
-    fn = parser.to_fn()
-    expected = [x]
+    def make_step(self) -> StepFn[T, V_co]:
+        step = self._parser.step_fn()
+        key = self._key
 
-    def label(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[V]:
-        return fn(stream, pos, rm).expect(expected)
+        def memo(
+                stream: Sequence[T],
+                pos: int) -> Union[Result[V_co], Step[V_co]]:
+            table = _memo.get()
+            if table is None:
+                return step(stream, pos)
+            return table.apply_step(key, step, stream, pos)
 
-    return FnParser(label)
+        return memo
+
+    def first(self) -> Optional[First]:
+        return self._parser.first()
+
+
+memo = MemoParser
 
 
 class InsertValue(Parser[T, V_co]):
@@ -374,12 +1466,184 @@ class InsertValue(Parser[T, V_co]):
             )])
         return Error(pos)
 
+    def fast_fn(self) -> FastFn[T, V_co]:
+        return lambda stream, pos: None
+
+    def first(self) -> Optional[First]:
+        return frozenset(), False
+
 
 insert = InsertValue
 
 
+Seeds = Dict[Tuple[object, int, int], Any]
+
+_seeds: ContextVar[Optional[Seeds]] = ContextVar("seeds", default=None)
+
+
+def _get_seeds() -> Seeds:
+    seeds = _seeds.get()
+    if seeds is None:
+        seeds = {}
+        _seeds.set(seeds)
+    return seeds
+
+
+def _grow(fn: ParseFn[T, V]) -> ParseFn[T, V]:
+    def attempt(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[V]:
+        tables = [t for t in (_memo.get(), _repairs.get()) if t is not None]
+        marks = [table.mark() for table in tables]
+        try:
+            return fn(stream, pos, rm)
+        finally:
+            for table, mark in zip(tables, marks):
+                table.discard(mark)
+
+    def extend(
+            stream: Sequence[T], pos: int, rm: RecoveryMode,
+            r: Result[V]) -> Result[V]:
+        seeds = _get_seeds()
+        key = (fn, id(stream), pos)
+        while type(r) is Ok:
+            seeds[key] = r
+            grown = attempt(stream, pos, None)
+            if type(grown) is Error:
+                if grown.pos == r.pos:
+                    return Ok(r.value, r.pos, grown.expected, r.consumed)
+                if rm is None:
+                    return grown
+                grown = attempt(stream, pos, True)
+                if type(grown) is Error:
+                    return grown
+            elif type(grown) is Ok and grown.pos <= r.pos:
+                return r
+            r = grown
+        if type(r) is Recovered:
+            return _continue_parse(
+                stream, r,
+                lambda s, p: extend(
+                    s, pos, True, Ok(p.value, p.pos, (), True)
+                ),
+                lambda _, v: v
+            )
+        return r
+
+    def grow(stream: Sequence[T], pos: int, rm: RecoveryMode) -> Result[V]:
+        seeds = _get_seeds()
+        key = (fn, id(stream), pos)
+        if key in seeds:
+            return seeds[key]  # type: ignore
+        seeds[key] = Error(pos)
+        try:
+            return extend(stream, pos, rm, attempt(stream, pos, rm))
+        finally:
+            del seeds[key]
+
+    return grow
+
+
+def _grow_fast(fn: FastFn[T, V], slow: ParseFn[T, V]) -> FastFn[T, V]:
+    def stops_at(stream: Sequence[T], pos: int, r: Tuple[V, int]) -> bool:
+        seeds = _get_seeds()
+        key = (slow, id(stream), pos)
+        seeds[key] = Ok(r[0], r[1], consumed=r[1] != pos)
+        try:
+            grown = slow(stream, pos, None)
+        finally:
+            del seeds[key]
+        return type(grown) is not Error or grown.pos == r[1]
+
+    def grow(stream: Sequence[T], pos: int) -> Optional[Tuple[V, int]]:
+        seeds = _get_seeds()
+        key = (fn, id(stream), pos)
+        if key in seeds:
+            return seeds[key]  # type: ignore
+        seeds[key] = None
+        try:
+            r = fn(stream, pos)
+            while r is not None:
+                seeds[key] = r
+                try:
+                    grown = fn(stream, pos)
+                except Abort as e:
+                    if e.pos == r[1] or e.pos is None and stops_at(
+                            stream, pos, r):
+                        return r
+                    raise
+                if grown is None or grown[1] <= r[1]:
+                    return r
+                r = grown
+            return r
+        finally:
+            del seeds[key]
+
+    return grow
+
+
+_STEP_DEPTH = 32
+
+_depth: ContextVar[Optional[List[int]]] = ContextVar("depth", default=None)
+
+
+def _get_depth() -> List[int]:
+    depth = _depth.get()
+    if depth is None:
+        depth = [0]
+        _depth.set(depth)
+    return depth
+
+
+def _grow_step(fn: StepFn[T, V]) -> StepFn[T, V]:
+    def attempt(stream: Sequence[T], pos: int) -> Step[V]:
+        tables = [t for t in (_memo.get(), _repairs.get()) if t is not None]
+        marks = [table.mark() for table in tables]
+        try:
+            return (yield fn(stream, pos))
+        finally:
+            for table, mark in zip(tables, marks):
+                table.discard(mark)
+
+    def grow(stream: Sequence[T], pos: int) -> Step[V]:
+        seeds = _get_seeds()
+        key = (fn, id(stream), pos)
+        if key in seeds:
+            return seeds[key]  # type: ignore
+        seeds[key] = Error(pos)
+        try:
+            r = yield attempt(stream, pos)
+            while type(r) is Ok:
+                seeds[key] = r
+                grown = yield attempt(stream, pos)
+                if type(grown) is Error:
+                    if grown.pos != r.pos:
+                        return grown
+                    return Ok(r.value, r.pos, grown.expected, r.consumed)
+                if type(grown) is not Ok or grown.pos <= r.pos:
+                    return r
+                r = grown
+            return r
+        finally:
+            del seeds[key]
+
+    return grow
+
+
+def _nested_fast(fn: FastFn[T, V], slow: FastFn[T, V]) -> FastFn[T, V]:
+    def nested(stream: Sequence[T], pos: int) -> Optional[Tuple[V, int]]:
+        depth = _get_depth()
+        if depth[0] >= _STEP_DEPTH:
+            return slow(stream, pos)
+        depth[0] += 1
+        try:
+            return fn(stream, pos)
+        finally:
+            depth[0] -= 1
+
+    return nested
+
+
 class Delay(Parser[T, V_co]):
-    def __init__(self) -> None:
+    def __init__(self, left_recursive: bool = False) -> None:
         def _fn(
                 stream: Sequence[T], pos: int,
                 rm: RecoveryMode) -> Result[V_co]:
@@ -387,12 +1651,34 @@ class Delay(Parser[T, V_co]):
 
         self._defined = False
         self._fn: ParseFn[T, V_co] = _fn
+        self._parser: Optional[Parser[T, V_co]] = None
+        self._fast: Optional[FastFn[T, V_co]] = None
+        self._step: Optional[StepFn[T, V_co]] = None
+        self._visiting = False
+        self._left_recursive = left_recursive
 
     def define(self, parser: Parser[T, V_co]) -> None:
         if self._defined:
             raise RuntimeError("Delayed parser was already defined")
         self._defined = True
-        self._fn = parser.to_fn()
+        fn = parser.to_fn()
+        if self._left_recursive:
+            fn = _grow(fn)
+
+        def nested(
+                stream: Sequence[T], pos: int,
+                rm: RecoveryMode) -> Result[V_co]:
+            depth = _get_depth()
+            if depth[0] >= _STEP_DEPTH and rm is None:
+                return run(self.step_fn()(stream, pos))
+            depth[0] += 1
+            try:
+                return fn(stream, pos, rm)
+            finally:
+                depth[0] -= 1
+
+        self._fn = nested
+        self._parser = parser
 
     def to_fn(self) -> ParseFn[T, V_co]:
         if self._defined:
@@ -404,6 +1690,44 @@ class Delay(Parser[T, V_co]):
             rm: RecoveryMode) -> Result[V_co]:
         return self._fn(stream, pos, rm)
 
+    def fast_fn(self) -> FastFn[T, V_co]:
+        if self._parser is None:
+            return super().fast_fn()
+        if self._fast is None:
+            fast: List[FastFn[T, V_co]] = []
+            self._fast = lambda stream, pos: fast[0](stream, pos)
+            parser_fast = self._parser.fast_fn()
+            if self._left_recursive:
+                parser_fast = _grow_fast(parser_fast, self._parser.to_fn())
+            fast.append(_nested_fast(parser_fast, _to_fast(self._fn)))
+            self._fast = fast[0]
+        return self._fast
+
+    def step_fn(self) -> StepFn[T, V_co]:
+        if self._parser is None:
+            return super().step_fn()
+        if self._step is None:
+            step: List[StepFn[T, V_co]] = []
+            self._step = lambda stream, pos: step[0](stream, pos)
+            parser_step = self._parser.step_fn()
+            if self._left_recursive:
+                parser_step = _grow_step(parser_step)
+            step.append(parser_step)
+            self._step = step[0]
+        return self._step
+
+    def deep(self) -> bool:
+        return True
+
+    def first(self) -> Optional[First]:
+        if self._parser is None or self._visiting:
+            return None
+        self._visiting = True
+        try:
+            return self._parser.first()
+        finally:
+            self._visiting = False
+
 
 def sep_by(parser: Parser[T, V], sep: Parser[T, U]) -> Parser[T, List[V]]:
     return maybe(parser + many(sep.rseq(parser))).fmap(
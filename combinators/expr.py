@@ -1,7 +1,17 @@
+from dataclasses import dataclass
 from functools import reduce
-from typing import Callable, List, Tuple, TypeVar
+from typing import (
+    Any, Callable, Generic, Iterable, Iterator, List, Literal, Optional,
+    Sequence, Tuple, TypeVar, Union
+)
 
-from .core import Parser
+from .chain import concat
+from .core import (
+    _STEP_DEPTH, Abort, Delay, FastFn, First, FnParser, ParseFn, Parser,
+    RecoveryMode, Seq, Step, StepFn, _continue_parse, _fast_result, _get_depth,
+    _get_seeds, disallow_recovery, maybe_allow_recovery, run
+)
+from .result import Error, Ok, Recovered, Result
 
 T = TypeVar('T')
 V = TypeVar('V')
@@ -11,9 +21,9 @@ U = TypeVar('U')
 def infix_left(
         arg: Parser[T, V], op: Parser[T, U],
         fn: Callable[[U, V, V], V]) -> Parser[T, V]:
-    return (
-        arg + (op + arg).many()
-    ).fmap(lambda v: reduce(lambda t, o: fn(o[0], t, o[1]), v[1], v[0]))
+    expr: Delay[T, V] = Delay(left_recursive=True)
+    expr.define(Seq(expr + op, arg, lambda l, r: fn(l[1], l[0], r)) | arg)
+    return expr
 
 
 def infix_right(
@@ -52,3 +62,369 @@ def postfix(
     return (
         arg + op.many()
     ).fmap(lambda v: reduce(fn, v[1], v[0]))
+
+
+@dataclass
+class Prefix(Generic[T, U, V]):
+    op: Parser[T, U]
+    fn: Callable[[U, V], V]
+
+
+@dataclass
+class Postfix(Generic[T, U, V]):
+    op: Parser[T, U]
+    fn: Callable[[V, U], V]
+
+
+@dataclass
+class Infix(Generic[T, U, V]):
+    op: Parser[T, U]
+    fn: Callable[[U, V, V], V]
+    assoc: Literal["left", "right", "non"] = "left"
+
+
+Operator = Union[Prefix[T, Any, V], Postfix[T, Any, V], Infix[T, Any, V]]
+OpInfo = Tuple[int, Optional[int], bool, Callable[..., V]]
+Tagged = Tuple[OpInfo[V], Any]
+
+
+def _tag(op: Parser[T, U], info: OpInfo[V]) -> Parser[T, Tagged[V]]:
+    return op.fmap(lambda u: (info, u))
+
+
+def _alt(parsers: List[Parser[T, V]]) -> Optional[Parser[T, V]]:
+    if not parsers:
+        return None
+    return reduce(lambda a, b: a | b, parsers)
+
+
+class LevelsExpected(Iterable[str]):
+    __slots__ = "_fns", "_stream", "_pos", "_expected"
+
+    def __init__(
+            self, fns: Sequence[ParseFn[T, Any]], stream: Sequence[T],
+            pos: int):
+        self._fns = fns
+        self._stream = stream
+        self._pos = pos
+        self._expected: Optional[List[str]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        if self._expected is None:
+            self._expected = []
+            for fn in reversed(self._fns):
+                r = fn(self._stream, self._pos, None)
+                if not r.consumed and type(r) is not Recovered:
+                    self._expected.extend(r.expected)
+        return iter(self._expected)
+
+
+class OperatorTable(FnParser[T, V]):
+    def __init__(
+            self, atom: Parser[T, V],
+            levels: Sequence[Sequence[Operator[T, V]]]):
+        top = len(levels) + 1
+        prefixes: List[Parser[T, Tagged[V]]] = []
+        infixes: List[Parser[T, Tagged[V]]] = []
+        level_fns: List[Optional[ParseFn[T, Any]]] = [None] * top
+        for i, level in enumerate(levels):
+            bp = top - 1 - i
+            ops: List[Parser[T, Any]] = []
+            for o in level:
+                if isinstance(o, Prefix):
+                    prefixes.append(_tag(o.op, (bp, bp, False, o.fn)))
+                    continue
+                if isinstance(o, Postfix):
+                    info: OpInfo[V] = (bp, None, False, o.fn)
+                else:
+                    rbp = bp if o.assoc == "right" else bp + 1
+                    info = (bp, rbp, o.assoc == "non", o.fn)
+                infixes.append(_tag(o.op, info))
+                ops.append(o.op)
+            level_op = _alt(ops)
+            if level_op is not None:
+                level_fns[bp] = level_op.to_fn()
+        nud = _alt(prefixes)
+        led = _alt(infixes)
+
+        def levels_expected(
+                stream: Sequence[T], pos: int, lo: int,
+                hi: int) -> Iterable[str]:
+            ranged = [fn for fn in level_fns[lo:hi] if fn is not None]
+            if not ranged:
+                return ()
+            return LevelsExpected(ranged, stream, pos)
+
+        atom_fn = atom.to_fn()
+        nud_fn = None if nud is None else nud.to_fn()
+        led_fn = None if led is None else led.to_fn()
+
+        def parse(
+                stream: Sequence[T], pos: int, rm: RecoveryMode,
+                bp: int) -> Result[V]:
+            if rm:
+                seeds = _get_seeds()
+                key = (parse_level, id(stream), pos)
+                if key in seeds:
+                    return Error(pos)
+                seeds[key] = None
+                try:
+                    return parse_level(stream, pos, rm, bp)
+                finally:
+                    del seeds[key]
+            depth = _get_depth()
+            if depth[0] >= _STEP_DEPTH and rm is None:
+                return run(self._step_parse()(stream, pos, bp))
+            depth[0] += 1
+            try:
+                return parse_level(stream, pos, rm, bp)
+            finally:
+                depth[0] -= 1
+
+        def parse_level(
+                stream: Sequence[T], pos: int, rm: RecoveryMode,
+                bp: int) -> Result[V]:
+            if nud_fn is not None:
+                rp = nud_fn(stream, pos, disallow_recovery(rm))
+                if type(rp) is Ok:
+                    (obp, _, _, fn), u = rp.value
+                    ra = parse(
+                        stream, rp.pos, maybe_allow_recovery(rm, rp), obp
+                    ).fmap(lambda a: fn(u, a)).merge_expected(
+                        rp.expected, rp.consumed
+                    )
+                    return climb(stream, ra, rm, bp, obp, top)
+                if type(rp) is Recovered:
+                    return rp.to_error()
+                if rp.consumed:
+                    return rp
+                ra = atom_fn(stream, pos, rm)
+                if not ra.consumed:
+                    ra = ra.expect(concat(rp.expected, ra.expected))
+            else:
+                ra = atom_fn(stream, pos, rm)
+            return climb(stream, ra, rm, bp, top, top)
+
+        def climb(
+                stream: Sequence[T], ra: Result[V], rm: RecoveryMode,
+                bp: int, covered: int, limit: int) -> Result[V]:
+            while True:
+                if type(ra) is Error:
+                    return ra
+                if type(ra) is Recovered:
+                    return _continue_parse(
+                        stream, ra,
+                        lambda s, p: climb(
+                            s, Ok(p.value, p.pos, (), True), True, bp,
+                            covered, limit
+                        ),
+                        lambda _, v: v
+                    )
+                if led_fn is None:
+                    return ra
+                ro = led_fn(stream, ra.pos, disallow_recovery(rm))
+                if type(ro) is Ok:
+                    (lbp, rbp, non, fn), u = ro.value
+                    if bp <= lbp < limit:
+                        expected = (
+                            ro.expected if ra.consumed and ro.consumed
+                            else concat(ra.expected, ro.expected)
+                        )
+                        consumed = ra.consumed or ro.consumed
+                        va = ra.value
+                        if rbp is None:
+                            ra = Ok(fn(va, u), ro.pos, expected, consumed)
+                            covered = top
+                            continue
+                        rb = parse(
+                            stream, ro.pos, maybe_allow_recovery(rm, ro), rbp
+                        )
+                        if type(rb) is Ok:
+                            ra = Ok(
+                                fn(u, va, rb.value), rb.pos,
+                                rb.expected if consumed and rb.consumed
+                                else concat(expected, rb.expected),
+                                consumed or rb.consumed
+                            )
+                        else:
+                            ra = rb.fmap(
+                                lambda vb: fn(u, va, vb)
+                            ).merge_expected(expected, consumed)
+                        covered = rbp
+                        if non:
+                            limit = lbp
+                        continue
+                elif type(ro) is Error and ro.consumed:
+                    return ro.merge_expected(ra.expected, ra.consumed)
+                return Ok(
+                    ra.value, ra.pos,
+                    concat(
+                        ra.expected,
+                        levels_expected(
+                            stream, ra.pos, bp, min(covered, limit)
+                        )
+                    ),
+                    ra.consumed
+                )
+
+        super().__init__(lambda stream, pos, rm: parse(stream, pos, rm, 1))
+        self._atom = atom
+        self._nud = nud
+        self._led = led
+        self._top = top
+        self._levels_expected = levels_expected
+        self._parse_step: Optional[
+            Callable[[Sequence[T], int, int], Step[V]]
+        ] = None
+
+    def first(self) -> Optional[First]:
+        fa = self._atom.first()
+        if fa is None or self._nud is None:
+            return fa
+        fp = self._nud.first()
+        if fp is None:
+            return None
+        return fa[0] | fp[0], fa[1] or fp[1]
+
+    def make_fast(self) -> FastFn[T, V]:
+        atom_fast = self._atom.fast_fn()
+        nud_fast = None if self._nud is None else self._nud.fast_fn()
+        led_fast = None if self._led is None else self._led.fast_fn()
+        top = self._top
+
+        def parse(
+                stream: Sequence[T], pos: int,
+                bp: int) -> Optional[Tuple[V, int]]:
+            depth = _get_depth()
+            if depth[0] >= _STEP_DEPTH:
+                return _fast_result(run(self._step_parse()(stream, pos, bp)))
+            depth[0] += 1
+            try:
+                return parse_level(stream, pos, bp)
+            finally:
+                depth[0] -= 1
+
+        def parse_level(
+                stream: Sequence[T], pos: int,
+                bp: int) -> Optional[Tuple[V, int]]:
+            rp = None if nud_fast is None else nud_fast(stream, pos)
+            if rp is not None:
+                (obp, _, _, fn), u = rp[0]
+                ra = parse(stream, rp[1], obp)
+                if ra is None:
+                    raise Abort(rp[1])
+                value, pos = fn(u, ra[0]), ra[1]
+            else:
+                ra = atom_fast(stream, pos)
+                if ra is None:
+                    return None
+                value, pos = ra
+            if led_fast is None:
+                return value, pos
+            limit = top
+            while True:
+                ro = led_fast(stream, pos)
+                if ro is None:
+                    return value, pos
+                (lbp, rbp, non, fn), u = ro[0]
+                if not bp <= lbp < limit:
+                    return value, pos
+                if rbp is None:
+                    value, pos = fn(value, u), ro[1]
+                    continue
+                rb = parse(stream, ro[1], rbp)
+                if rb is None:
+                    raise Abort(ro[1])
+                value, pos = fn(u, value, rb[0]), rb[1]
+                if non:
+                    limit = lbp
+
+        return lambda stream, pos: parse(stream, pos, 1)
+
+    def deep(self) -> bool:
+        return True
+
+    def make_step(self) -> StepFn[T, V]:
+        parse = self._step_parse()
+        return lambda stream, pos: parse(stream, pos, 1)
+
+    def _step_parse(self) -> Callable[[Sequence[T], int, int], Step[V]]:
+        if self._parse_step is None:
+            self._parse_step = self._make_step_parse()
+        return self._parse_step
+
+    def _make_step_parse(
+            self) -> Callable[[Sequence[T], int, int], Step[V]]:
+        atom_step = self._atom.step_fn()
+        nud_step = None if self._nud is None else self._nud.step_fn()
+        led_step = None if self._led is None else self._led.step_fn()
+        top = self._top
+        levels_expected = self._levels_expected
+
+        def parse(stream: Sequence[T], pos: int, bp: int) -> Step[V]:
+            covered = top
+            rp = None if nud_step is None else (yield nud_step(stream, pos))
+            if type(rp) is Ok:
+                (obp, _, _, fn), u = rp.value
+                ra = yield parse(stream, rp.pos, obp)
+                ra = ra.fmap(lambda a: fn(u, a)).merge_expected(
+                    rp.expected, rp.consumed
+                )
+                covered = obp
+            elif type(rp) is Recovered:
+                return rp.to_error()
+            elif rp is not None and rp.consumed:
+                return rp
+            else:
+                ra = yield atom_step(stream, pos)
+                if rp is not None and not ra.consumed:
+                    ra = ra.expect(concat(rp.expected, ra.expected))
+            limit = top
+            while True:
+                if type(ra) is not Ok or led_step is None:
+                    return ra
+                ro = yield led_step(stream, ra.pos)
+                if type(ro) is Ok:
+                    (lbp, rbp, non, fn), u = ro.value
+                    if bp <= lbp < limit:
+                        expected = (
+                            ro.expected if ra.consumed and ro.consumed
+                            else concat(ra.expected, ro.expected)
+                        )
+                        consumed = ra.consumed or ro.consumed
+                        va = ra.value
+                        if rbp is None:
+                            ra = Ok(fn(va, u), ro.pos, expected, consumed)
+                            covered = top
+                            continue
+                        rb = yield parse(stream, ro.pos, rbp)
+                        if type(rb) is Ok:
+                            ra = Ok(
+                                fn(u, va, rb.value), rb.pos,
+                                rb.expected if consumed and rb.consumed
+                                else concat(expected, rb.expected),
+                                consumed or rb.consumed
+                            )
+                        else:
+                            ra = rb.merge_expected(expected, consumed)
+                        covered = rbp
+                        if non:
+                            limit = lbp
+                        continue
+                elif type(ro) is Error and ro.consumed:
+                    return ro.merge_expected(ra.expected, ra.consumed)
+                return Ok(
+                    ra.value, ra.pos,
+                    concat(
+                        ra.expected,
+                        levels_expected(
+                            stream, ra.pos, bp, min(covered, limit)
+                        )
+                    ),
+                    ra.consumed
+                )
+
+        return parse
+
+
+operator_table = OperatorTable
@@ -0,0 +1,108 @@
+from array import array
+from bisect import bisect_left
+from typing import (
+    Container, Generic, Iterator, List, Optional, Pattern, Tuple, TypeVar,
+    Union
+)
+
+from .core import Memo, Parser, Recovery
+from .lexer import Token
+from .result import Result
+
+V = TypeVar("V", bound=object)
+
+
+def iter_spans(
+        src: str, spec: Pattern[str],
+        pos: int = 0) -> Iterator[Tuple[int, int, Token]]:
+    src_len = len(src)
+    while pos < src_len:
+        match = spec.match(src, pos=pos)
+        if match is None:
+            raise ValueError()
+        kind = match.lastgroup
+        if kind is not None:
+            yield match.start(), match.end(), Token(kind, match.group(kind))
+        pos = match.end()
+
+
+class Document(Generic[V]):
+    def __init__(
+            self, parser: Parser[Token, V], spec: Pattern[str], src: str = "",
+            recover: Union[bool, Recovery] = False, lookahead: int = 0,
+            partial: Container[Optional[str]] = ()):
+        self._parser = parser
+        self._spec = spec
+        self._lookahead = lookahead
+        self._partial = partial
+        self._recover = recover
+        self.src = src
+        self.tokens: List[Token] = []
+        self.starts = array("q")
+        self.ends = array("q")
+        for start, end, tok in iter_spans(src, spec):
+            self.tokens.append(tok)
+            self.starts.append(start)
+            self.ends.append(end)
+        self.memo = Memo()
+        self.result: Result[V] = parser.parse(self.tokens, recover, self.memo)
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> Result[V]:
+        if offset < 0 or deleted < 0 or offset + deleted > len(self.src):
+            raise IndexError("edit out of range")
+        src = self.src[:offset] + inserted + self.src[offset + deleted:]
+        delta = len(inserted) - deleted
+        edit_end = offset + len(inserted)
+
+        start = bisect_left(self.ends, offset - self._lookahead)
+        start = next((
+            i for i in range(start) if self.tokens[i].kind in self._partial
+        ), start)
+        while start > 0 and (
+                self.tokens[start - 1].kind in self._partial
+                or not self._unchanged(src, start - 1)):
+            start -= 1
+        stop = len(self.tokens)
+        tokens: List[Token] = []
+        starts = array("q")
+        ends = array("q")
+        pos = self.ends[start - 1] if start > 0 else 0
+        for tok_start, tok_end, tok in iter_spans(src, self._spec, pos):
+            if tok_start >= edit_end:
+                old = bisect_left(self.starts, tok_start - delta)
+                if old < stop and self.starts[old] == tok_start - delta:
+                    stop = old
+                    break
+            if (
+                    not tokens and start < stop
+                    and self.starts[start] == tok_start
+                    and self.ends[start] == tok_end
+                    and self.tokens[start] == tok):
+                start += 1
+                continue
+            tokens.append(tok)
+            starts.append(tok_start)
+            ends.append(tok_end)
+
+        self.src = src
+        self.tokens = self.tokens[:start] + tokens + self.tokens[stop:]
+        self.starts = self.starts[:start] + starts + array(
+            "q", [s + delta for s in self.starts[stop:]]
+        )
+        self.ends = self.ends[:start] + ends + array(
+            "q", [e + delta for e in self.ends[stop:]]
+        )
+        self.memo = self.memo.edit(
+            self.tokens, start, stop, len(tokens) - stop + start
+        )
+        self.result = self._parser.parse(
+            self.tokens, self._recover, self.memo
+        )
+        return self.result
+
+    def _unchanged(self, src: str, i: int) -> bool:
+        match = self._spec.match(src, pos=self.starts[i])
+        return (
+            match is not None and match.end() == self.ends[i]
+            and match.lastgroup == self.tokens[i].kind
+        )
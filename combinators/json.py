@@ -1,8 +1,17 @@
 import re
-from typing import Match
+from functools import reduce
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Match, Optional, Sequence,
+    Tuple, Union
+)
 
-from .core import Delay, Parser, eof, insert, sym
-from .lexer import Token, split_tokens, token
+from .batch import map_chunks
+from .core import (
+    Abort, Delay, FastFn, First, FnParser, Parser, StepFn, eof, insert, label,
+    satisfy, sym
+)
+from .lexer import Token, Tokens, kind, map_file, split_tokens, token
+from .result import ParseError
 
 spec = re.compile(r"""
 [ \n\r\t]+
@@ -20,6 +29,23 @@ spec = re.compile(r"""
 |(?P<_>.)
 """, re.VERBOSE)
 
+utf8 = r"""(?:
+    [\xC2-\xDF][\x80-\xBF]
+    |\xE0[\xA0-\xBF][\x80-\xBF]
+    |[\xE1-\xEC\xEE\xEF][\x80-\xBF]{2}
+    |\xED[\x80-\x9F][\x80-\xBF]
+    |\xF0[\x90-\xBF][\x80-\xBF]{2}
+    |[\xF1-\xF3][\x80-\xBF]{3}
+    |\xF4[\x80-\x8F][\x80-\xBF]{2}
+)"""
+
+bytes_spec = re.compile(
+    spec.pattern.replace(
+        "\\U0010FFFF]", "\\x7F]|" + utf8
+    ).replace("(?P<_>.)", "(?P<_>" + utf8 + "|.)").encode(),
+    re.VERBOSE
+)
+
 
 escape = re.compile(r"""
 \\(?:(?P<simple>["\\/bfnrt])|u(?P<unicode>[0-9a-fA-F]{4}))
@@ -32,6 +58,9 @@ simple = {
 
 
 def unescape(s: str) -> str:
+    if "\\" not in s:
+        return s
+
     def sub(m: Match[str]) -> str:
         if m.lastgroup == "unicode":
             return chr(int(m.group("unicode"), 16))
@@ -66,11 +95,193 @@ value.define(
     (
         integer | number | boolean | null | string | insert(1)
         | json_dict | json_list
-    ).label("value")
+    ).label("value").memo()
+)
+
+skipped: Delay[Token, None] = Delay()
+
+skipped_key: JsonParser = token("string")
+skipped_scalar: JsonParser = (
+    token("integer") | token("float") | token("bool") | token("null")
+    | token("string")
+)
+skipped_dict: JsonParser = (
+    (skipped_key | insert(None)).lseq(punct(":")) + skipped
+).sep_by(punct(",")).between(punct("{"), punct("}")).label("object")
+skipped_list: JsonParser = skipped.sep_by(punct(",")).between(
+    punct("["), punct("]")
+).label("list")
+skipped_value: JsonParser = (
+    skipped_scalar | insert(None) | skipped_dict | skipped_list
 )
 
+skipped.define(skipped_value.fmap(lambda v: None).label("value").memo())
+
+_SCALARS = frozenset(["string", "integer", "float", "bool", "null"])
+
+
+def _kind_at(stream: Sequence[Token]) -> Callable[[int], str]:
+    if isinstance(stream, Tokens):
+        kinds = stream.kinds
+        names = stream.names
+        value = stream.value
+
+        def code_at(i: int) -> str:
+            name = names[kinds[i]]
+            return value(i) if name == "punct" else name
+
+        return code_at
+
+    def kind_at(i: int) -> str:
+        t = stream[i]
+        return t.value if t.kind == "punct" else t.kind
+
+    return kind_at
+
+
+class SkipValue(FnParser[Token, None]):
+    def __init__(self, parser: Parser[Token, None]):
+        super().__init__(parser.to_fn())
+        self._parser = parser
+
+    def make_fast(self) -> FastFn[Token, None]:
+        def skip(
+                stream: Sequence[Token],
+                start: int) -> Optional[Tuple[None, int]]:
+            kind_at = _kind_at(stream)
+            end = len(stream)
+            closers: List[str] = []
+            key = False
+            pos = start
+            while True:
+                if key:
+                    if pos + 1 >= end or kind_at(pos) != "string":
+                        break
+                    pos += 1
+                    if kind_at(pos) != ":":
+                        break
+                    pos += 1
+                k = kind_at(pos) if pos < end else ""
+                if k in _SCALARS:
+                    pos += 1
+                elif k == "{" or k == "[":
+                    pos += 1
+                    close = "}" if k == "{" else "]"
+                    if pos >= end or kind_at(pos) != close:
+                        closers.append(close)
+                        key = close == "}"
+                        continue
+                    pos += 1
+                else:
+                    break
+                while closers:
+                    k = kind_at(pos) if pos < end else ""
+                    if k == ",":
+                        pos += 1
+                        key = closers[-1] == "}"
+                        break
+                    if k != closers[-1]:
+                        raise Abort(pos)
+                    closers.pop()
+                    pos += 1
+                else:
+                    return None, pos
+            if pos == start:
+                return None
+            raise Abort(pos)
+
+        return skip
+
+    def deep(self) -> bool:
+        return self._parser.deep()
+
+    def make_step(self) -> StepFn[Token, None]:
+        return self._parser.step_fn()
+
+    def first(self) -> Optional[First]:
+        return self._parser.first()
+
+
+skip_value = SkipValue(skipped)
+
 json = value.lseq(eof())
+json_compiled = json.compile()
+json_valid: Parser[Token, object] = skip_value.lseq(eof()).compile()
+
+Member = Tuple[str, object]
+Selection = Dict[str, Any]
+
+_skipped_member: Member = ("", None)
+
+
+def _selection(paths: Iterable[Sequence[str]]) -> Optional[Selection]:
+    tree: Selection = {}
+    for path in paths:
+        if not path:
+            return None
+        node = tree
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+            if node is None:
+                break
+        else:
+            node[path[-1]] = None
+    return tree
+
+
+def _member(key: str, parser: JsonParser) -> Parser[Token, Member]:
+    return label(satisfy(
+        lambda t: t.kind == "string" and unescape(t.value) == key,
+        kind, ["string"]
+    ), "string").lseq(punct(":")).rseq(parser).fmap(lambda v: (key, v))
+
+
+def _projection(tree: Optional[Selection]) -> JsonParser:
+    if tree is None:
+        return value
+    node: Delay[Token, object] = Delay()
+    members = [_member(key, _projection(sub)) for key, sub in tree.items()]
+    rest = token("string").lseq(punct(":")).rseq(skip_value).fmap(
+        lambda v: _skipped_member
+    )
+    member = reduce(lambda a, b: a | b, [*members, rest])
+    projected_dict: JsonParser = member.sep_by(punct(",")).fmap(
+        lambda v: dict(m for m in v if m is not _skipped_member)
+    ).between(punct("{"), punct("}")).label("object")
+    projected_list: JsonParser = node.sep_by(punct(",")).between(
+        punct("["), punct("]")
+    ).label("list")
+    node.define(
+        (projected_dict | projected_list | skip_value).label("value")
+    )
+    return node
+
+
+def projection(paths: Iterable[Sequence[str]]) -> Parser[Token, object]:
+    return _projection(_selection(paths)).lseq(eof()).compile()
+
+
+def parse(
+        src: str, compact: bool = False,
+        parser: Parser[Token, object] = json_compiled) -> object:
+    tokens = Tokens(src, spec) if compact else split_tokens(src, spec)
+    return parser.parse(tokens).unwrap()
+
+
+def parse_file(
+        path: str, parser: Parser[Token, object] = json_compiled,
+        workers: Optional[int] = 1) -> object:
+    tokens = Tokens(
+        map_file(path), bytes_spec, errors="replace", workers=workers
+    )
+    return parser.parse(tokens).unwrap()
+
+
+def validate(src: str, compact: bool = False) -> None:
+    parse(src, compact, json_valid)
 
 
-def parse(src: str) -> object:
-    return json.parse(split_tokens(src, spec)).unwrap()
+def parse_many(
+        srcs: Iterable[str], workers: Optional[int] = None,
+        chunksize: int = 256) -> Iterator[Union[object, ParseError]]:
+    return map_chunks(parse, srcs, (ParseError,), workers, chunksize)
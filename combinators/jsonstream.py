@@ -0,0 +1,163 @@
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .json import spec, unescape
+from .lexer import Token, iter_chunk_tokens
+from .result import ErrorItem, ParseError
+
+RawEvent = Tuple[str, Optional[Token]]
+Event = Tuple[str, object]
+
+_VALUE = ["value"]
+_VALUE_OR_END_ARRAY = ["value", "']'"]
+_KEY = ["string"]
+_KEY_OR_END_MAP = ["string", "'}'"]
+_COLON = ["':'"]
+_COMMA_OR_END_ARRAY = ["','", "']'"]
+_COMMA_OR_END_MAP = ["','", "'}'"]
+_END = ["end of file"]
+
+_SCALARS = {"string", "integer", "float", "bool", "null"}
+
+
+def iter_tokens(fp: IO[str], chunk_size: int = 65536) -> Iterator[Token]:
+    return iter_chunk_tokens(
+        iter(lambda: fp.read(chunk_size), ""), spec, 3, {"_"}
+    )
+
+
+def iter_events(
+        tokens: Iterable[Token], multiple: bool = False) -> Iterator[RawEvent]:
+    stack: List[str] = []
+    expected = _VALUE
+    pos = 0
+    for tok in tokens:
+        kind = tok.kind
+        punct = tok.value if kind == "punct" else None
+        if expected is _END and multiple:
+            expected = _VALUE
+        if expected is _VALUE or expected is _VALUE_OR_END_ARRAY:
+            if kind in _SCALARS:
+                expected = _after_value(stack)
+                yield "value", tok
+            elif punct == "{":
+                stack.append("{")
+                expected = _KEY_OR_END_MAP
+                yield "start_map", None
+            elif punct == "[":
+                stack.append("[")
+                expected = _VALUE_OR_END_ARRAY
+                yield "start_array", None
+            elif punct == "]" and expected is _VALUE_OR_END_ARRAY:
+                stack.pop()
+                expected = _after_value(stack)
+                yield "end_array", None
+            else:
+                raise ParseError([ErrorItem(pos, expected)])
+        elif expected is _KEY or expected is _KEY_OR_END_MAP:
+            if kind == "string":
+                expected = _COLON
+                yield "map_key", tok
+            elif punct == "}" and expected is _KEY_OR_END_MAP:
+                stack.pop()
+                expected = _after_value(stack)
+                yield "end_map", None
+            else:
+                raise ParseError([ErrorItem(pos, expected)])
+        elif expected is _COLON:
+            if punct != ":":
+                raise ParseError([ErrorItem(pos, expected)])
+            expected = _VALUE
+        elif expected is _COMMA_OR_END_MAP or expected is _COMMA_OR_END_ARRAY:
+            end = "}" if expected is _COMMA_OR_END_MAP else "]"
+            if punct == ",":
+                expected = _KEY if end == "}" else _VALUE
+            elif punct == end:
+                stack.pop()
+                expected = _after_value(stack)
+                yield "end_map" if end == "}" else "end_array", None
+            else:
+                raise ParseError([ErrorItem(pos, expected)])
+        else:
+            raise ParseError([ErrorItem(pos, expected)])
+        pos += 1
+    if expected is not _END and not (
+            multiple and expected is _VALUE and not stack):
+        raise ParseError([ErrorItem(pos, expected)])
+
+
+def _after_value(stack: List[str]) -> List[str]:
+    if not stack:
+        return _END
+    if stack[-1] == "{":
+        return _COMMA_OR_END_MAP
+    return _COMMA_OR_END_ARRAY
+
+
+def scalar(tok: Token) -> object:
+    kind = tok.kind
+    if kind == "string":
+        return unescape(tok.value)
+    if kind == "integer":
+        return int(tok.value)
+    if kind == "float":
+        return float(tok.value)
+    if kind == "bool":
+        return tok.value == "true"
+    return None
+
+
+def iterparse(
+        fp: IO[str], chunk_size: int = 65536,
+        multiple: bool = False) -> Iterator[Event]:
+    for event, tok in iter_events(iter_tokens(fp, chunk_size), multiple):
+        if tok is None:
+            yield event, None
+        elif event == "map_key":
+            yield event, unescape(tok.value)
+        else:
+            yield event, scalar(tok)
+
+
+def _build(event: RawEvent, events: Iterator[RawEvent]) -> object:
+    stack: List[Union[Dict[str, object], List[object]]] = []
+    keys: List[str] = []
+    while True:
+        kind, tok = event
+        if kind == "start_map" or kind == "start_array":
+            stack.append({} if kind == "start_map" else [])
+        elif kind == "map_key":
+            assert tok is not None
+            keys.append(unescape(tok.value))
+        else:
+            if kind == "value":
+                assert tok is not None
+                value = scalar(tok)
+            else:
+                value = stack.pop()
+            if not stack:
+                return value
+            top = stack[-1]
+            if isinstance(top, dict):
+                top[keys.pop()] = value
+            else:
+                top.append(value)
+        event = next(events)
+
+
+def values(fp: IO[str], chunk_size: int = 65536) -> Iterator[object]:
+    events = iter_events(iter_tokens(fp, chunk_size), True)
+    for event in events:
+        yield _build(event, events)
+
+
+def items(fp: IO[str], chunk_size: int = 65536) -> Iterator[object]:
+    events = iter_events(iter_tokens(fp, chunk_size))
+    event = next(events, None)
+    if event is None or event[0] != "start_array":
+        raise ParseError([ErrorItem(0, ["list"])])
+    for event in events:
+        if event[0] == "end_array":
+            break
+        yield _build(event, events)
+    for _ in events:
+        pass
@@ -1,5 +1,12 @@
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Iterator, List, Optional, Pattern, Tuple
+from mmap import ACCESS_READ, mmap
+from typing import (
+    Any, Container, Iterable, Iterator, List, Optional, Pattern, Sequence,
+    Tuple, Union, overload
+)
 
 from .core import Parser, insert, label, satisfy
 
@@ -15,11 +22,45 @@ class Token:
 
 def iter_tokens(src: str, spec: Pattern[str]) -> Iterator[Token]:
     line = 0
+    line_start = 0
+    nl = src.find("\n")
+    pos = 0
+    for match in spec.finditer(src):
+        if match.start() != pos:
+            raise ValueError()
+        kind = match.lastgroup
+        if kind is not None:
+            while nl != -1 and nl < pos:
+                line += 1
+                line_start = nl + 1
+                nl = src.find("\n", line_start)
+            yield Token(kind, match[kind], (line, pos - line_start))
+        pos = match.end()
+    if pos != len(src):
+        raise ValueError()
+
+
+def iter_chunk_tokens(
+        chunks: Iterable[str], spec: Pattern[str], lookahead: int = 0,
+        partial: Container[Optional[str]] = ()) -> Iterator[Token]:
+    line = 0
     col = 0
     pos = 0
-    src_len = len(src)
-    while pos < src_len:
-        match = spec.match(src, pos=pos)
+    buf = ""
+    chunks = iter(chunks)
+    more = True
+    while more or pos < len(buf):
+        match = spec.match(buf, pos=pos)
+        if more and (
+                match is None or match.end() + lookahead >= len(buf)
+                or match.lastgroup in partial):
+            chunk = next(chunks, None)
+            if chunk is None:
+                more = False
+            else:
+                buf = buf[pos:] + chunk
+                pos = 0
+            continue
         if match is None:
             raise ValueError()
         kind = match.lastgroup
@@ -40,8 +81,159 @@ def split_tokens(src: str, spec: Pattern[str]) -> List[Token]:
     return list(iter_tokens(src, spec))
 
 
+def kind(t: Token) -> str:
+    return t.kind
+
+
+Source = Union[str, bytes, mmap]
+
+
+Scan = Tuple["array[int]", "array[int]", "array[int]", "array[int]", int, int]
+
+
+def _names(spec: Pattern[Any]) -> List[str]:
+    return sorted(spec.groupindex, key=spec.groupindex.__getitem__)
+
+
+def _scan(
+        src: Source, spec: Pattern[Any], offset: str = "q",
+        base: int = 0) -> Scan:
+    codes = {name: code for code, name in enumerate(_names(spec))}
+    kinds = array("B")
+    starts = array(offset)
+    ends = array(offset)
+    skips = array("B")
+    head = -1
+    tail = 0
+    pos = 0
+    for match in spec.finditer(src):
+        if match.start() != pos:
+            raise ValueError()
+        kind = match.lastgroup
+        pos = match.end()
+        if kind is not None:
+            start = match.start(kind)
+            kinds.append(codes[kind])
+            starts.append(base + start)
+            ends.append(base + match.end(kind))
+            skips.append(start - match.start())
+            if head == -1:
+                head = match.start()
+            tail = pos
+    if pos != len(src):
+        raise ValueError()
+    return kinds, starts, ends, skips, head, tail
+
+
+def _scan_chunk(args: Tuple[Source, Pattern[Any], str, int]) -> Scan:
+    return _scan(*args)
+
+
+def _scan_parallel(
+        src: Source, spec: Pattern[Any], offset: str, workers: Optional[int],
+        chunk_size: int) -> Optional[List[Scan]]:
+    newline: Any = "\n" if isinstance(src, str) else b"\n"
+    bounds = [0]
+    while bounds[-1] < len(src):
+        nl = src.find(newline, bounds[-1] + chunk_size)
+        bounds.append(len(src) if nl == -1 else nl + 1)
+    if len(bounds) < 3:
+        return None
+    chunks = [
+        (src[start:end], spec, offset, start)
+        for start, end in zip(bounds, bounds[1:])
+    ]
+    with ProcessPoolExecutor(workers) as pool:
+        parts = list(pool.map(_scan_chunk, chunks))
+    for prev_start, start, prev, part in zip(
+            bounds, bounds[1:], parts, parts[1:]):
+        head, tail = part[4], prev[5]
+        if head == -1 or prev[4] == -1 or prev_start + tail == start:
+            return None
+        pos = prev_start + tail
+        while pos < start + head:
+            match = spec.match(src, pos)
+            if match is None or match.lastgroup is not None:
+                return None
+            pos = match.end()
+        if pos != start + head:
+            return None
+    return parts
+
+
+class Tokens(Sequence[Token]):
+    def __init__(
+            self, src: Source, spec: Pattern[Any], encoding: str = "utf-8",
+            errors: str = "strict", workers: Optional[int] = 1,
+            chunk_size: int = 1 << 20):
+        self._src = src
+        self._encoding = encoding
+        self._errors = errors
+        self.names = _names(spec)
+        offset = "I" if len(src) < 1 << 32 else "q"
+        self._lines: Optional[array[int]] = None
+
+        parts = None
+        if workers != 1 and len(src) > chunk_size:
+            parts = _scan_parallel(src, spec, offset, workers, chunk_size)
+        if parts is None:
+            parts = [_scan(src, spec, offset)]
+        self.kinds, self.starts, self.ends, self.skips, _, _ = parts[0]
+        for kinds, starts, ends, skips, _, _ in parts[1:]:
+            self.kinds.extend(kinds)
+            self.starts.extend(starts)
+            self.ends.extend(ends)
+            self.skips.extend(skips)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @overload
+    def __getitem__(self, i: int) -> Token:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Token]:
+        ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Token, List[Token]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return Token(self.names[self.kinds[i]], self.value(i))
+
+    def kind(self, i: int) -> str:
+        return self.names[self.kinds[i]]
+
+    def value(self, i: int) -> str:
+        value = self._src[self.starts[i]:self.ends[i]]
+        if isinstance(value, str):
+            return value
+        return value.decode(self._encoding, self._errors)
+
+    def loc(self, i: int) -> Tuple[int, int]:
+        if self._lines is None:
+            src = self._src
+            newline: Any = "\n" if isinstance(src, str) else b"\n"
+            self._lines = array("q", [-1])
+            nl = src.find(newline)
+            while nl != -1:
+                self._lines.append(nl)
+                nl = src.find(newline, nl + 1)
+        start = self.starts[i] - self.skips[i]
+        line = bisect_right(self._lines, start - 1) - 1
+        return line, start - self._lines[line] - 1
+
+
+def map_file(path: str) -> Union[bytes, mmap]:
+    with open(path, "rb") as fp:
+        try:
+            return mmap(fp.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            return fp.read()
+
+
 def token(k: str) -> Parser[Token, Token]:
-    return label(satisfy(lambda t: t.kind == k), k)
+    return label(satisfy(lambda t: t.kind == k, kind, [k]), k)
 
 
 def token_ins(kind: str, ins_value: str) -> Parser[Token, Token]:
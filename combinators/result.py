@@ -3,7 +3,7 @@ from typing import Callable, Generic, Iterable, List, NoReturn, TypeVar, Union
 
 from typing_extensions import Literal, final
 
-from .chain import Chain
+from .chain import concat, unique
 
 V = TypeVar("V", bound=object)
 V_co = TypeVar("V_co", covariant=True)
@@ -53,18 +53,18 @@ class Ok(Generic[V_co]):
         return Ok(fn(self.value), self.pos, self.expected, self.consumed)
 
     def expect(self, expected: Iterable[str]) -> "Ok[V_co]":
-        if self.consumed:
+        if self.consumed or self.expected is expected:
             return self
         return Ok(self.value, self.pos, expected, self.consumed)
 
     def merge_expected(
             self, expected: Iterable[str], consumed: bool) -> "Ok[V_co]":
-        if consumed and self.consumed:
+        if self.consumed and (consumed or not expected):
             return self
-        return Ok(
-            self.value, self.pos, Chain(expected, self.expected),
-            consumed or self.consumed
-        )
+        merged = concat(expected, self.expected)
+        if merged is self.expected and consumed == self.consumed:
+            return self
+        return Ok(self.value, self.pos, merged, consumed or self.consumed)
 
 
 @final
@@ -79,23 +79,24 @@ class Error:
         self.consumed = consumed
 
     def unwrap(self, recover: bool = False) -> NoReturn:
-        raise ParseError([ErrorItem(self.pos, list(self.expected))])
+        raise ParseError([ErrorItem(self.pos, unique(self.expected))])
 
     def fmap(self, fn: object) -> "Error":
         return self
 
     def expect(self, expected: Iterable[str]) -> "Error":
-        if self.consumed:
+        if self.consumed or self.expected is expected:
             return self
         return Error(self.pos, expected, self.consumed)
 
     def merge_expected(
             self, expected: Iterable[str], consumed: bool) -> "Error":
-        if consumed and self.consumed:
+        if self.consumed and (consumed or not expected):
             return self
-        return Error(
-            self.pos, Chain(expected, self.expected), consumed or self.consumed
-        )
+        merged = concat(expected, self.expected)
+        if merged is self.expected and consumed == self.consumed:
+            return self
+        return Error(self.pos, merged, consumed or self.consumed)
 
 
 @dataclass
@@ -150,8 +151,8 @@ class Recovered(Generic[V_co]):
             return repair.value
         errors: List[ErrorItem] = []
         for item in repair.prefix:
-            errors.append(ErrorItem(item.op.pos, list(item.expected)))
-        errors.append(ErrorItem(repair.op.pos, list(repair.expected)))
+            errors.append(ErrorItem(item.op.pos, unique(item.expected)))
+        errors.append(ErrorItem(repair.op.pos, unique(repair.expected)))
         raise ParseError(errors)
 
     def fmap(self, fn: Callable[[V_co], U]) -> "Recovered[U]":
@@ -180,7 +181,7 @@ class Recovered(Generic[V_co]):
             Repair(
                 p.cost, p.value, p.pos, p.op,
                 p.expected if consumed and p.consumed
-                else Chain(expected, p.expected),
+                else concat(expected, p.expected),
                 consumed or p.consumed, p.prefix
             )
             for p in self.repairs
@@ -0,0 +1,189 @@
+from typing import List, Tuple, Union
+
+import pytest
+
+from combinators.core import Delay, Parser, Seq, digit, eof, sym
+from combinators.expr import (
+    Infix, Postfix, Prefix, infix_left, infix_non, infix_right, operator_table,
+    postfix, prefix
+)
+from combinators.result import ParseError
+
+Tree = Union[str, Tuple[object, ...]]
+
+num: Parser[str, Tree] = (digit + digit.many()).fmap(
+    lambda v: v[0] + "".join(v[1])
+)
+unary: Parser[str, Tree] = prefix(sym("-"), num, lambda o, a: (o, a))
+fact: Parser[str, Tree] = postfix(unary, sym("!"), lambda a, o: (o, a))
+power: Parser[str, Tree] = infix_right(
+    fact, sym("^"), lambda o, l, r: (o, l, r)
+)
+product: Parser[str, Tree] = infix_left(
+    power, sym("*") | sym("/"), lambda o, l, r: (o, l, r)
+)
+total: Parser[str, Tree] = infix_left(
+    product, sym("+") | sym("-"), lambda o, l, r: (o, l, r)
+)
+expr: Parser[str, Tree] = infix_non(
+    total, sym("<"), lambda o, l, r: (o, l, r)
+).lseq(eof())
+
+DATA_POSITIVE = [
+    ("1", "1"),
+    ("1-2-3", ("-", ("-", "1", "2"), "3")),
+    ("1+2*3", ("+", "1", ("*", "2", "3"))),
+    ("1*2/3+4", ("+", ("/", ("*", "1", "2"), "3"), "4")),
+    ("2^3^4", ("^", "2", ("^", "3", "4"))),
+    ("3!!", ("!", ("!", "3"))),
+    ("--1!", ("!", ("-", ("-", "1")))),
+    ("1+2<3", ("<", ("+", "1", "2"), "3")),
+]
+
+
+@pytest.mark.parametrize("data, expected", DATA_POSITIVE)
+def test_positive(data: str, expected: Tree) -> None:
+    assert expected == expr.parse(data).unwrap()
+    assert expected == expr.compile().parse(data).unwrap()
+
+
+DATA_NEGATIVE = [
+    ("1+", 2, ["'-'", "digit"]),
+    ("1 ", 1, [
+        "'-'", "digit", "'!'", "'^'", "'*'", "'/'", "'+'", "'<'",
+        "end of file"
+    ]),
+    ("1<2<3", 3, [
+        "'-'", "digit", "'!'", "'^'", "'*'", "'/'", "'+'", "end of file"
+    ]),
+]
+
+
+@pytest.mark.parametrize("data, pos, expected", DATA_NEGATIVE)
+def test_negative(data: str, pos: int, expected: List[str]) -> None:
+    for parser in [expr, expr.compile()]:
+        with pytest.raises(ParseError) as err:
+            parser.parse(data).unwrap()
+        assert pos == err.value.errors[0].pos
+        assert expected == err.value.errors[0].expected
+
+
+def test_consumed_failure() -> None:
+    parser = total.lseq(sym("+").many())
+    with pytest.raises(ParseError) as err:
+        parser.compile().parse("1+2+").unwrap()
+    assert 4 == err.value.errors[0].pos
+
+
+def test_long_chain() -> None:
+    data = "-".join(["1"] * 5000)
+    tree: object = expr.compile().parse(data).unwrap()
+    depth = 0
+    while isinstance(tree, tuple):
+        tree = tree[1]
+        depth += 1
+    assert depth == 4999
+
+
+def test_memo() -> None:
+    diff: Delay[str, Tree] = Delay(left_recursive=True)
+    diff.define(
+        Seq(diff + sym("-"), num, lambda l, r: binary(l[1], l[0], r)).memo()
+        | num
+    )
+    parser = diff.lseq(eof())
+    expected = ("-", ("-", "1", "1"), "1")
+    assert expected == parser.parse("1-1-1", memo=True).unwrap()
+    assert expected == parser.parse("1-1-1", recover=True, memo=True).unwrap()
+
+
+def test_recovery() -> None:
+    group: Delay[str, Tree] = Delay()
+    sums = infix_left(
+        num | group.between(sym("("), sym(")")), sym("+"),
+        lambda o, l, r: (o, l, r)
+    )
+    group.define(sums)
+    r = sums.lseq(eof()).parse("(1+2+3", recover=True)
+    assert ("+", ("+", "1", "2"), "3") == r.unwrap(recover=True)
+    with pytest.raises(ParseError) as err:
+        r.unwrap()
+    assert 6 == err.value.errors[0].pos
+
+
+def binary(o: str, l: Tree, r: Tree) -> Tree:
+    return (o, l, r)
+
+
+nested: Delay[str, Tree] = Delay()
+table: Parser[str, Tree] = operator_table(
+    num | nested.between(sym("("), sym(")")), [
+        [Prefix(sym("-"), lambda o, a: (o, a))],
+        [Postfix(sym("!"), lambda a, o: (o, a))],
+        [Infix(sym("^"), binary, "right")],
+        [Infix(sym("*"), binary), Infix(sym("/"), binary)],
+        [Infix(sym("+"), binary), Infix(sym("-"), binary)],
+        [Infix(sym("<"), binary, "non")],
+    ]
+)
+nested.define(table)
+table_expr = table.lseq(eof())
+
+
+@pytest.mark.parametrize("data, expected", DATA_POSITIVE + [
+    ("(1+2)*3", ("*", ("+", "1", "2"), "3")),
+    ("-(1<2)!", ("!", ("-", ("<", "1", "2")))),
+])
+def test_table_positive(data: str, expected: Tree) -> None:
+    assert expected == table_expr.parse(data).unwrap()
+    assert expected == table_expr.compile().parse(data).unwrap()
+
+
+DATA_TABLE_NEGATIVE = [
+    ("1+", 2, ["'-'", "digit", "'('"]),
+    ("1 ", 1, [
+        "digit", "'!'", "'^'", "'*'", "'/'", "'+'", "'-'", "'<'",
+        "end of file"
+    ]),
+    ("1<2<3", 3, [
+        "digit", "'!'", "'^'", "'*'", "'/'", "'+'", "'-'", "end of file"
+    ]),
+    ("(1*2", 4, ["digit", "'!'", "'^'", "'*'", "'/'", "'+'", "'-'", "'<'",
+                 "')'"]),
+]
+
+
+@pytest.mark.parametrize("data, pos, expected", DATA_TABLE_NEGATIVE)
+def test_table_negative(data: str, pos: int, expected: List[str]) -> None:
+    for parser in [table_expr, table_expr.compile()]:
+        with pytest.raises(ParseError) as err:
+            parser.parse(data).unwrap()
+        assert pos == err.value.errors[0].pos
+        assert expected == err.value.errors[0].expected
+
+
+def test_table_recovery() -> None:
+    r = table_expr.parse("1+(2*3", recover=True)
+    assert ("+", "1", ("*", "2", "3")) == r.unwrap(recover=True)
+    with pytest.raises(ParseError) as err:
+        r.unwrap()
+    assert 6 == err.value.errors[0].pos
+
+
+@pytest.mark.parametrize("data, pos", [
+    ("1+", 2), ("", 0), ("(", 1), ("1*", 2), ("1+(", 3),
+])
+def test_table_recovery_truncated(data: str, pos: int) -> None:
+    with pytest.raises(ParseError) as err:
+        table_expr.parse(data, recover=True).unwrap(recover=True)
+    assert pos == err.value.errors[0].pos
+
+
+def test_table_deep() -> None:
+    data = "(" * 5000 + "1" + ")" * 5000 + "^2" * 5000
+    tree: object = table_expr.compile().parse(data).unwrap()
+    depth = 0
+    while isinstance(tree, tuple):
+        tree = tree[2]
+        depth += 1
+    assert depth == 5000
@@ -0,0 +1,109 @@
+from typing import Any, List, Pattern, Tuple, cast
+
+import pytest
+
+from combinators import json
+from combinators.incremental import Document
+from combinators.lexer import split_tokens
+from combinators.result import ParseError, Result
+
+DATA = '{"a": [1, 2, {"b": "x y"}],\n "c": null, "d": [true, 1.5e3]}'
+
+EDITS: List[Tuple[int, int, str]] = [
+    (0, 0, " "),
+    (7, 1, "10"),
+    (9, 0, '"'),
+    (10, 0, '"'),
+    (20, 3, ""),
+    (29, 0, "\n"),
+    (33, 4, "true"),
+    (44, 2, "5"),
+    (1, 3, "ab"),
+    (59, 0, "]"),
+    (0, 59, "[]"),
+]
+
+
+def document(src: str, spec: Pattern[str] = json.spec) -> Document[object]:
+    return Document(json.json, spec, src, lookahead=3, partial={"_"})
+
+
+def outcome(r: Result[object]) -> object:
+    try:
+        return r.unwrap()
+    except ParseError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("offset, deleted, inserted", EDITS)
+def test_edit(offset: int, deleted: int, inserted: str) -> None:
+    doc = document(DATA)
+    r = doc.edit(offset, deleted, inserted)
+    src = DATA[:offset] + inserted + DATA[offset + deleted:]
+    tokens = split_tokens(src, json.spec)
+    assert doc.src == src
+    assert doc.tokens == tokens
+    assert outcome(r) == outcome(json.json.parse(tokens))
+
+
+def test_sequence() -> None:
+    doc = document(DATA)
+    for offset, deleted, inserted in EDITS:
+        offset = min(offset, len(doc.src))
+        deleted = min(deleted, len(doc.src) - offset)
+        r = doc.edit(offset, deleted, inserted)
+        tokens = split_tokens(doc.src, json.spec)
+        assert doc.tokens == tokens
+        assert outcome(r) == outcome(json.json.parse(tokens))
+
+
+def test_reuse() -> None:
+    data = "[" + ", ".join('{"a": [1, 2]}' for _ in range(100)) + "]"
+    doc = document(data)
+    r = doc.edit(data.index("2", len(data) // 2), 1, "[3]")
+    assert doc.memo.hits == 100
+    assert doc.memo.misses < 10
+    value = r.unwrap()
+    assert isinstance(value, list)
+    assert value[50] == {"a": [1, [3]]}
+
+
+def test_out_of_range() -> None:
+    doc = document(DATA)
+    with pytest.raises(IndexError):
+        doc.edit(len(DATA), 1, "")
+
+
+@pytest.mark.parametrize("data, offset, deleted, inserted", [
+    ('["abc, 1]', 5, 0, '"'),
+    ('["abc", 1]', 5, 1, ""),
+    ("[1 2]", 2, 0, ".5"),
+    ("[1, tru]", 7, 0, "e"),
+    ('["a, 1, 2]', 9, 0, '"'),
+])
+def test_partial(data: str, offset: int, deleted: int, inserted: str) -> None:
+    doc = document(data)
+    r = doc.edit(offset, deleted, inserted)
+    tokens = split_tokens(doc.src, json.spec)
+    assert doc.tokens == tokens
+    assert outcome(r) == outcome(json.json.parse(tokens))
+
+
+class CountingSpec:
+    def __init__(self, spec: Pattern[str]):
+        self.spec = spec
+        self.matches = 0
+
+    def match(self, src: str, pos: int = 0) -> Any:
+        self.matches += 1
+        return self.spec.match(src, pos)
+
+
+def test_single_line() -> None:
+    data = "[" + ", ".join('{"a": [1, 2]}' for _ in range(1000)) + "]"
+    spec = CountingSpec(json.spec)
+    doc = document(data, cast(Pattern[str], spec))
+    spec.matches = 0
+    doc.edit(data.index("2", len(data) // 2), 1, "[3]")
+    assert doc.tokens == split_tokens(doc.src, json.spec)
+    assert spec.matches < 20
@@ -1,9 +1,11 @@
+from pathlib import Path
 from typing import List, Tuple
 
 import pytest
 
 from combinators import json
-from combinators.lexer import split_tokens
+from combinators.core import Profile, ProfileNode
+from combinators.lexer import Tokens, split_tokens
 from combinators.result import ParseError
 
 DATA_POSITIVE: List[Tuple[str, object]] = [
@@ -89,3 +91,186 @@ def test_recovery(data: str, value: str, expected: str) -> None:
     with pytest.raises(ParseError) as err:
         r.unwrap()
     assert expected == str(err.value)
+
+
+@pytest.mark.parametrize("data, expected", DATA_POSITIVE)
+def test_compact(data: str, expected: object) -> None:
+    assert expected == json.parse(data, compact=True)
+
+
+def test_tokens() -> None:
+    data = '{"a":\n [1, 2.5,\n"x\\ny"],\n  "b": null}'
+    tokens = Tokens(data, json.spec)
+    expected = split_tokens(data, json.spec)
+    assert expected == list(tokens)
+    assert [t.loc for t in expected] == [
+        tokens.loc(i) for i in range(len(tokens))
+    ]
+
+
+@pytest.mark.parametrize("data, expected", DATA_POSITIVE)
+def test_file(data: str, expected: object, tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    path.write_text(data)
+    assert expected == json.parse_file(str(path))
+
+
+@pytest.mark.parametrize("data", [
+    "[1, \u00e9]".encode(),
+    b"[1, \xff]",
+    b'["a\xff"]',
+    b'["\xe9"]',
+])
+def test_file_negative(data: bytes, tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    path.write_bytes(data)
+    with pytest.raises(ParseError):
+        json.parse_file(str(path))
+
+
+def test_bytes_tokens() -> None:
+    data = '{"\u00e9":\n ["\u00fcber", 2.5]}'
+    tokens = Tokens(data.encode(), json.bytes_spec)
+    expected = split_tokens(data, json.spec)
+    assert expected == list(tokens)
+    assert [(0, 0), (0, 1), (0, 5), (1, 1), (1, 2), (1, 9), (1, 11), (1, 14),
+            (1, 15)] == [tokens.loc(i) for i in range(len(tokens))]
+
+
+@pytest.mark.parametrize("data", [
+    '[\n  {"a": 1,\n   "b": "x y"},\n  2.5,\n\n\n  null\n]\n',
+    '\n\n[1,\n2]',
+    '[1,\n2,\n3]',
+    '[1,\n"\\"\n"]',
+    '[1,\n\n\n\n\n\n\n\n2]',
+])
+def test_parallel_tokens(data: str) -> None:
+    expected = split_tokens(data, json.spec)
+    tokens = Tokens(data, json.spec, workers=2, chunk_size=3)
+    assert expected == list(tokens)
+    assert [t.loc for t in expected] == [
+        tokens.loc(i) for i in range(len(tokens))
+    ]
+    assert expected == list(
+        Tokens(data.encode(), json.bytes_spec, workers=2, chunk_size=3)
+    )
+
+
+def test_recovery_many_errors() -> None:
+    data = "[" + ", ".join(["[1 2]"] * 100) + "]"
+    r = json.json.parse(split_tokens(data, json.spec), recover=True)
+    assert [[1]] * 100 == r.unwrap(recover=True)
+
+
+def _calls(node: ProfileNode) -> int:
+    return node.calls + sum(_calls(c) for c in node.children.values())
+
+
+def test_recovery_nested_errors() -> None:
+    calls = []
+    for n in [20, 40]:
+        data = '{"items": [' + ", ".join(['{"a": [1], "b": tru}'] * n) + "]}"
+        profile = Profile()
+        r = json.json.parse(
+            split_tokens(data, json.spec), recover=True, profile=profile
+        )
+        assert {"items": [{"a": [1], "b": 1}] * n} == r.unwrap(recover=True)
+        calls.append(_calls(profile.root))
+    assert calls[1] < 3 * calls[0]
+
+
+def test_deep() -> None:
+    assert json.parse("[" * 5000 + "]" * 5000) is not None
+    tokens = split_tokens("[" * 5000 + "]" * 5000, json.spec)
+    assert json.json.parse(tokens, memo=True).unwrap() is not None
+    profile = Profile()
+    assert json.json.parse(tokens, profile=profile).unwrap() is not None
+    rules = {rule.name: rule for rule in profile.rules()}
+    assert rules["value"].calls == 5001
+    with pytest.raises(ParseError) as err:
+        json.parse("[" * 5000 + "1 2" + "]" * 5000)
+    assert str(err.value) == "at 5001: expected ',' or ']'"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many(workers: int) -> None:
+    srcs = [data for data, _ in DATA_POSITIVE] + [
+        data for data, _ in DATA_NEGATIVE
+    ]
+    results = list(json.parse_many(srcs, workers, chunksize=3))
+    assert [expected for _, expected in DATA_POSITIVE] == results[
+        :len(DATA_POSITIVE)
+    ]
+    errors = results[len(DATA_POSITIVE):]
+    assert all(isinstance(e, ParseError) for e in errors)
+    assert [expected for _, expected in DATA_NEGATIVE] == [
+        str(e) for e in errors
+    ]
+
+
+@pytest.mark.parametrize("data, expected", DATA_POSITIVE)
+def test_validate(data: str, expected: object) -> None:
+    json.validate(data)
+    json.validate(data, compact=True)
+
+
+@pytest.mark.parametrize("data, expected", DATA_NEGATIVE + [
+    ("[1,]", "at 3: expected value"),
+    ("{,}", "at 1: expected string or '}'"),
+    ('{"a": 1,}', "at 5: expected string"),
+    ('{"a" 1}', "at 2: expected ':'"),
+    ("[[1] [2]]", "at 4: expected ',' or ']'"),
+    ("]", "at 0: expected value"),
+])
+def test_validate_negative(data: str, expected: str) -> None:
+    for compact in [False, True]:
+        with pytest.raises(ParseError) as err:
+            json.validate(data, compact)
+        assert expected == str(err.value)
+
+
+def test_validate_deep() -> None:
+    json.validate("[" * 5000 + "]" * 5000)
+    with pytest.raises(ParseError) as err:
+        json.validate("[" * 5000 + "1 2" + "]" * 5000)
+    assert str(err.value) == "at 5001: expected ',' or ']'"
+
+
+DATA_PROJECTION: List[Tuple[List[List[str]], str, object]] = [
+    ([["a"]], '{"a": [1, {"b": 2}], "b": 3}', {"a": [1, {"b": 2}]}),
+    (
+        [["a", "b"], ["c"]],
+        '{"c": null, "a": {"b": "x", "c": [true]}, "d": {"b": 1}}',
+        {"c": None, "a": {"b": "x"}}
+    ),
+    ([["a", "b"], ["a"]], '{"a": {"b": 1, "c": 2}}', {"a": {"b": 1, "c": 2}}),
+    (
+        [["a", "b"]], '[{"a": {"b": 1}}, {"a": 2}, 3]',
+        [{"a": {"b": 1}}, {"a": None}, None]
+    ),
+    ([["\n"]], '{"\\n": 1, "\\\\n": 2}', {"\n": 1}),
+    ([[]], '{"a": 1}', {"a": 1}),
+]
+
+
+@pytest.mark.parametrize("paths, data, expected", DATA_PROJECTION)
+def test_projection(
+        paths: List[List[str]], data: str, expected: object) -> None:
+    parser = json.projection(paths)
+    assert expected == json.parse(data, parser=parser)
+    assert expected == json.parse(data, compact=True, parser=parser)
+
+
+def test_projection_negative() -> None:
+    parser = json.projection([["a"]])
+    with pytest.raises(ParseError) as err:
+        json.parse('{"a": 1, "b": {"c": 1 2}}', parser=parser)
+    assert str(err.value) == "at 11: expected ',' or '}'"
+
+
+def test_projection_file(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    path.write_text('{"é": {"x": [1, 2]}, "y": "über"}')
+    assert {"é": {"x": [1, 2]}} == json.parse_file(
+        str(path), json.projection([["é", "x"]])
+    )
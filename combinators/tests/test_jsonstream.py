@@ -0,0 +1,63 @@
+from io import StringIO
+from typing import List
+
+import pytest
+
+from combinators import jsonstream
+from combinators.result import ParseError
+
+from .test_json import DATA_NEGATIVE, DATA_POSITIVE
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 65536])
+@pytest.mark.parametrize("data, expected", DATA_POSITIVE)
+def test_positive(data: str, expected: object, chunk_size: int) -> None:
+    assert [expected] == list(jsonstream.values(StringIO(data), chunk_size))
+
+
+@pytest.mark.parametrize("data, expected", DATA_NEGATIVE)
+def test_negative(data: str, expected: str) -> None:
+    with pytest.raises(ParseError) as err:
+        list(jsonstream.iterparse(StringIO(data)))
+    assert expected == str(err.value)
+
+
+def test_events() -> None:
+    data = '{"a": [1, 2.5e1], "b\\n": {"c": null}}'
+    assert list(jsonstream.iterparse(StringIO(data), 4)) == [
+        ("start_map", None),
+        ("map_key", "a"),
+        ("start_array", None),
+        ("value", 1),
+        ("value", 25.0),
+        ("end_array", None),
+        ("map_key", "b\n"),
+        ("start_map", None),
+        ("map_key", "c"),
+        ("value", None),
+        ("end_map", None),
+        ("end_map", None),
+    ]
+
+
+def test_items() -> None:
+    data = '[{"a": [1]}, 2, "three", [true]]'
+    assert list(jsonstream.items(StringIO(data), 2)) == [
+        {"a": [1]}, 2, "three", [True]
+    ]
+
+
+def test_items_trailing() -> None:
+    items: List[object] = []
+    with pytest.raises(ParseError) as err:
+        for item in jsonstream.items(StringIO("[1, 2] 3")):
+            items.append(item)
+    assert items == [1, 2]
+    assert "at 5: expected end of file" == str(err.value)
+
+
+def test_values() -> None:
+    data = '{"a": 1}\n{"a": 2}\n[]\n'
+    assert list(jsonstream.values(StringIO(data), 5)) == [
+        {"a": 1}, {"a": 2}, []
+    ]
@@ -1,9 +1,13 @@
-from typing import List
+from typing import Iterable, List
 
 import pytest
 
-from combinators.core import Parser, digit, letter, sym
-from combinators.result import ParseError
+from combinators.chain import Chain, ChainL, ChainR, concat
+from combinators.core import (
+    Delay, Index, Memo, Parser, Profile, Recovery, digit, letter, run, satisfy,
+    sym
+)
+from combinators.result import Error, ParseError, Recovered
 
 ident = (
     (letter | sym("_")) + (letter | digit | sym("_")).many()
@@ -31,3 +35,184 @@ def test_negative(
     with pytest.raises(ParseError) as err:
         parser.parse(data).unwrap()
     assert expected == err.value.errors[0].expected
+
+
+def test_memo() -> None:
+    calls = 0
+
+    def count(t: str) -> bool:
+        nonlocal calls
+        calls += 1
+        return t == "a"
+
+    parser: Parser[str, str] = satisfy(count).memo()
+    for _ in range(10):
+        parser = (parser | parser.fmap(str.upper)).memo()
+
+    memo = Memo()
+    r = parser.parse("b", recover=True, memo=memo)
+    assert calls == 2
+    assert memo.misses == 21
+    assert memo.hits == 38
+    with pytest.raises(ParseError):
+        r.unwrap()
+
+    calls = 0
+    assert parser.parse("a", memo=True).unwrap() == "a"
+    assert calls == 1
+
+
+def test_memo_reuse() -> None:
+    parser = (sym("a") | sym("b")).memo()
+    memo = Memo()
+    assert parser.parse("a", memo=memo).unwrap() == "a"
+    assert parser.parse("b", memo=memo).unwrap() == "b"
+    assert memo.misses == 1
+
+    data = ["b"]
+    assert parser.parse(data, memo=memo).unwrap() == "b"
+    assert parser.parse(data, memo=memo).unwrap() == "b"
+    assert (memo.hits, memo.misses) == (1, 1)
+
+    assert parser.parse("a", memo=Memo(size=0)).unwrap() == "a"
+
+
+@pytest.mark.parametrize("parser, data, value", DATA_POSITIVE)
+def test_compiled_positive(
+        parser: Parser[str, str], data: str, value: str) -> None:
+    assert value == parser.compile().parse(data).unwrap()
+
+
+@pytest.mark.parametrize("parser, data, expected", DATA_NEGATIVE)
+def test_compiled_negative(
+        parser: Parser[str, str], data: str, expected: List[str]) -> None:
+    with pytest.raises(ParseError) as err:
+        parser.compile().parse(data).unwrap()
+    assert expected == err.value.errors[0].expected
+
+
+def test_dispatch() -> None:
+    calls: List[str] = []
+
+    def char(c: str) -> Parser[str, str]:
+        def test(t: str) -> bool:
+            calls.append(c)
+            return t == c
+        return satisfy(test, str.lower, [c]).label(c)
+
+    parser = char("a") | char("b") | sym("c") | char("d")
+    assert parser.first() == (
+        frozenset([(str.lower, "a"), (str.lower, "b"), (None, "c"),
+                   (str.lower, "d")]),
+        False
+    )
+    assert parser.parse("d").unwrap() == "d"
+    assert calls == ["d"]
+    assert parser.compile().parse("b").unwrap() == "b"
+    assert calls == ["d", "b"]
+
+    with pytest.raises(ParseError) as err:
+        parser.parse("e").unwrap()
+    assert ["a", "b", "'c'", "d"] == err.value.errors[0].expected
+
+
+def test_dispatch_unhashable() -> None:
+    def is_x(t: object) -> bool:
+        return t == ["x"]
+
+    syms: Parser[object, object] = sym[object]("a") | sym[object]("b")
+    stream: List[object] = [["x"]]
+    assert (syms | satisfy(is_x)).parse(stream).unwrap() == ["x"]
+    assert (syms | satisfy(is_x)).compile().parse(stream).unwrap() == ["x"]
+    with pytest.raises(ParseError) as err:
+        syms.parse(stream).unwrap()
+    assert ["'a'", "'b'"] == err.value.errors[0].expected
+
+
+def test_recovery_budget() -> None:
+    parser = sym("a") + sym("b")
+    r = parser.parse("xxxab", recover=True)
+    assert isinstance(r, Recovered)
+    assert sorted(p.cost for p in r.repairs) == [2, 3]
+    assert r.unwrap(recover=True) == ("a", "b")
+
+    r = parser.parse("xxxab", recover=Recovery(budget=2))
+    assert isinstance(r, Recovered)
+    assert [p.cost for p in r.repairs] == [2]
+
+    r = parser.parse("xxxab", recover=Recovery(beam=1))
+    assert isinstance(r, Recovered)
+    assert [p.cost for p in r.repairs] == [3]
+
+
+def test_index() -> None:
+    index = Index("abcabc")
+    assert index.find("b", 0, 6) == 1
+    assert index.find("b", 2, 6) == 4
+    assert index.find("b", 2, 4) is None
+    assert index.find("d", 0, 6) is None
+
+    lists = Index([["a"], ["b"], ["a"]])
+    assert lists.find(["a"], 1, 3) == 2
+
+
+def test_deep() -> None:
+    calls = 0
+
+    def inc(v: int) -> int:
+        nonlocal calls
+        calls += 1
+        return v + 1
+
+    nested: Delay[str, int] = Delay()
+    nested.define(
+        nested.between(sym("("), sym(")")).fmap(inc)
+        | sym("x").fmap(lambda _: 0)
+    )
+    data = "(" * 5000 + "x" + ")" * 5000
+    for parser in [nested, nested.compile()]:
+        calls = 0
+        assert parser.parse(data).unwrap() == 5000
+        assert calls == 5000
+    assert nested.parse(data, memo=True).unwrap() == 5000
+    assert run(nested.step_fn()("((x))", 0)).unwrap() == 2
+
+    with pytest.raises(ParseError) as err:
+        nested.parse(data[:-1]).unwrap()
+    assert ["')'"] == err.value.errors[0].expected
+
+
+def test_profile() -> None:
+    number = digit.many().fmap("".join).label("number")
+    parser = (number | ident.label("ident")).sep_by(sym(",")).label("list")
+    profile = Profile()
+    r = parser.compile().parse("a1,23,b", profile=profile)
+    assert r.unwrap() == ["a1", "23", "b"]
+
+    rules = {rule.name: rule for rule in profile.rules()}
+    assert rules["list"].calls == 1
+    assert rules["list"].consumed == 7
+    assert (rules["number"].calls, rules["number"].consumed) == (3, 2)
+    assert (rules["ident"].calls, rules["ident"].consumed) == (2, 3)
+    assert (rules["letter"].calls, rules["letter"].failed) == (5, 3)
+    assert (rules["digit"].calls, rules["digit"].failed) == (8, 5)
+    assert profile.report().splitlines()[1].split()[0] == "list"
+    assert [
+        line.rsplit(" ", 1)[0] for line in profile.collapsed().splitlines()
+    ] == [
+        "list", "list;number", "list;number;digit", "list;ident",
+        "list;ident;letter", "list;ident;digit"
+    ]
+
+
+def test_chain() -> None:
+    chain: Iterable[str] = ["b"]
+    for i in range(100000):
+        chain = concat(ChainR(ChainL("a", chain), "c"), ["d"])
+    items = list(Chain(chain, ["e"]))
+    assert len(items) == 300002
+    assert items[:4] == ["a"] * 4 and items[-3:] == ["c", "d", "e"]
+
+    with pytest.raises(ParseError) as err:
+        Error(0, Chain(chain, ["e"])).unwrap()
+    assert ["a", "b", "c", "d", "e"] == err.value.errors[0].expected
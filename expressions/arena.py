@@ -0,0 +1,87 @@
+from array import array
+from typing import Callable, Dict, List, Tuple, TypeVar
+
+N = TypeVar("N")
+
+
+class Arena:
+    def __init__(self) -> None:
+        self.ops = array("i")
+        self.lhs = array("i")
+        self.rhs = array("i")
+        self.names: List[str] = []
+        self.arity: List[int] = []
+        self.leaves: List[str] = []
+        self._opcodes: Dict[Tuple[str, int], int] = {}
+        self._nodes: Dict[int, int] = {}
+        self._terms: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def opcode(self, name: str, arity: int) -> int:
+        code = self._opcodes.get((name, arity))
+        if code is None:
+            code = self._opcodes[name, arity] = len(self.names)
+            self.names.append(name)
+            self.arity.append(arity)
+        return code
+
+    def _node(self, op: int, lhs: int, rhs: int) -> int:
+        key = (op << 32 | lhs + 1) << 32 | rhs + 1
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = len(self.ops)
+            self.ops.append(op)
+            self.lhs.append(lhs)
+            self.rhs.append(rhs)
+        return node
+
+    def term(self, kind: str, value: str) -> int:
+        node = self._terms.get((kind, value))
+        if node is None:
+            self.leaves.append(value)
+            node = self._terms[kind, value] = self._node(
+                self.opcode(kind, 0), len(self.leaves) - 1, -1
+            )
+        return node
+
+    def unary(self, op: str, arg: int) -> int:
+        return self._node(self.opcode(op, 1), arg, -1)
+
+    def binary(self, op: str, lhs: int, rhs: int) -> int:
+        return self._node(self.opcode(op, 2), lhs, rhs)
+
+    def reachable(self, root: int) -> List[int]:
+        ops = self.ops
+        lhs = self.lhs
+        rhs = self.rhs
+        arity = self.arity
+        marks = bytearray(root + 1)
+        marks[root] = 1
+        for node in range(root, -1, -1):
+            if marks[node]:
+                n = arity[ops[node]]
+                if n > 0:
+                    marks[lhs[node]] = 1
+                    if n > 1:
+                        marks[rhs[node]] = 1
+        return [node for node in range(root + 1) if marks[node]]
+
+    def to_node(
+            self, root: int, binary: Callable[[str, N, N], N],
+            unary: Callable[[str, N], N], term: Callable[[str, str], N]) -> N:
+        built: Dict[int, N] = {}
+        for node in self.reachable(root):
+            op = self.ops[node]
+            n = self.arity[op]
+            if n == 0:
+                built[node] = term(self.names[op], self.leaves[self.lhs[node]])
+            elif n == 1:
+                built[node] = unary(self.names[op], built[self.lhs[node]])
+            else:
+                built[node] = binary(
+                    self.names[op], built[self.lhs[node]],
+                    built[self.rhs[node]]
+                )
+        return built[root]
@@ -0,0 +1,50 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar,
+    Union
+)
+
+T = TypeVar("T")
+V = TypeVar("V")
+
+Errors = Tuple[Type[Exception], ...]
+
+
+def run_chunk(
+        fn: Callable[[T], V], errors: Errors,
+        chunk: List[T]) -> List[Union[V, Exception]]:
+    results: List[Union[V, Exception]] = []
+    for item in chunk:
+        try:
+            results.append(fn(item))
+        except errors as e:
+            results.append(e)
+    return results
+
+
+def map_chunks(
+        fn: Callable[[T], V], items: Iterable[T], errors: Errors,
+        workers: Optional[int] = None,
+        chunksize: int = 256) -> Iterator[Union[V, Exception]]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    it = iter(items)
+    chunks = iter(lambda: list(islice(it, chunksize)), [])
+    if workers <= 1:
+        for chunk in chunks:
+            yield from run_chunk(fn, errors, chunk)
+        return
+    pool = ProcessPoolExecutor(workers)
+    pending: Deque[Future[List[Union[V, Exception]]]] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(run_chunk, fn, errors, chunk))
+            if len(pending) > 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Dict, List, Mapping, Set
+
+import numpy as np
+
+from .arena import Arena
+from .pratt import Binary, Node, Term, Unary
+
+_FACTORIALS = np.append(
+    np.cumprod(np.concatenate(([1.0], np.arange(1.0, 171.0)))), np.inf
+)
+
+
+def factorial(x: Any) -> Any:
+    valid = (x >= 0) & (x == np.floor(x))
+    index = np.where(valid, np.minimum(x, 171), 0).astype(np.intp)
+    return np.where(valid, _FACTORIALS[index], np.nan)
+
+
+UNARY: Dict[str, Callable[[Any], Any]] = {
+    "pos": np.positive,
+    "neg": np.negative,
+    "fact": factorial,
+}
+
+BINARY: Dict[str, Callable[[Any, Any], Any]] = {
+    "add": np.add,
+    "sub": np.subtract,
+    "mul": np.multiply,
+    "div": np.true_divide,
+    "pow": np.power,
+}
+
+
+def _add_node(arena: Arena, node: Node) -> int:
+    ids: Dict[int, int] = {}
+    stack = [node]
+    while stack:
+        top = stack[-1]
+        if isinstance(top, Binary):
+            children = [top.lhs, top.rhs]
+        elif isinstance(top, Unary):
+            children = [top.arg]
+        elif isinstance(top, Term):
+            children = []
+        else:
+            raise ValueError("Unknown node")
+        pending = [c for c in children if id(c) not in ids]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if isinstance(top, Binary):
+            if top.op not in BINARY:
+                raise ValueError("Unknown operator {!r}".format(top.op))
+            ids[id(top)] = arena.binary(
+                top.op, ids[id(top.lhs)], ids[id(top.rhs)]
+            )
+        elif isinstance(top, Unary):
+            if top.op not in UNARY:
+                raise ValueError("Unknown operator {!r}".format(top.op))
+            ids[id(top)] = arena.unary(top.op, ids[id(top.arg)])
+        else:
+            assert isinstance(top, Term)
+            ids[id(top)] = arena.term(top.kind, top.value)
+    return ids[id(node)]
+
+
+class Formula:
+    def __init__(self, node: Node):
+        self.arena = Arena()
+        self.root = _add_node(self.arena, node)
+        self.nodes = self.arena.reachable(self.root)
+        arena = self.arena
+        variables: Set[str] = set()
+        self.uses = [0] * (self.root + 1)
+        for index in self.nodes:
+            op = arena.ops[index]
+            n = arena.arity[op]
+            if n == 0 and arena.names[op] == "ident":
+                variables.add(arena.leaves[arena.lhs[index]])
+            if n > 0:
+                self.uses[arena.lhs[index]] += 1
+            if n > 1:
+                self.uses[arena.rhs[index]] += 1
+        self.variables = sorted(variables)
+
+    def __call__(self, columns: Mapping[str, Any]) -> Any:
+        arena = self.arena
+        names = arena.names
+        arity = arena.arity
+        uses = list(self.uses)
+        shape = np.broadcast_shapes(
+            *(np.shape(columns[name]) for name in self.variables)
+        )
+        values: List[Any] = [None] * (self.root + 1)
+        with np.errstate(all="ignore"):
+            for node in self.nodes:
+                op = arena.ops[node]
+                name = names[op]
+                n = arity[op]
+                lhs = arena.lhs[node]
+                if n == 0:
+                    leaf = arena.leaves[lhs]
+                    if name == "ident":
+                        value = np.asarray(columns[leaf], dtype=np.float64)
+                    else:
+                        value = np.float64(leaf)
+                elif n == 1:
+                    value = UNARY[name](values[lhs])
+                    _release(values, uses, lhs)
+                else:
+                    rhs = arena.rhs[node]
+                    value = BINARY[name](values[lhs], values[rhs])
+                    _release(values, uses, lhs)
+                    _release(values, uses, rhs)
+                values[node] = value
+        result = values[self.root]
+        if np.shape(result) != shape:
+            result = np.full(shape, result)
+        return result
+
+
+def _release(values: List[Any], uses: List[int], node: int) -> None:
+    uses[node] -= 1
+    if uses[node] == 0:
+        values[node] = None
+
+
+def evaluate(node: Node, columns: Mapping[str, Any]) -> Any:
+    return Formula(node)(columns)
@@ -1,4 +1,7 @@
-from typing import Iterable, Iterator, NamedTuple, Pattern
+from mmap import ACCESS_READ, mmap
+from typing import (
+    Dict, Iterable, Iterator, List, NamedTuple, Pattern, Tuple, Union
+)
 
 
 class Token(NamedTuple):
@@ -7,17 +10,111 @@ class Token(NamedTuple):
 
 
 def split_tokens(src: str, spec: Pattern[str], eof: Token) -> Iterator[Token]:
+    tokens: List[Token] = []
+    append = tokens.append
+    new = tuple.__new__
     pos = 0
-    src_len = len(src)
-    while pos < src_len:
-        match = spec.match(src, pos=pos)
-        if match is None:
+    for match in spec.finditer(src):
+        if match.start() != pos:
             raise ValueError()
         kind = match.lastgroup
         if kind is not None:
-            yield Token(kind, match.group(kind))
+            append(new(Token, (kind, match[kind])))
         pos = match.end()
-    yield eof
+    if pos != len(src):
+        raise ValueError()
+    append(eof)
+    return iter(tokens)
+
+
+def split_codes(
+        src: str, spec: Pattern[str], kinds: Dict[str, int],
+        symbols: Dict[str, int], eof: int) -> Tuple[List[int], List[str]]:
+    codes: List[int] = []
+    values: List[str] = []
+    append_code = codes.append
+    append_value = values.append
+    pos = 0
+    for match in spec.finditer(src):
+        if match.start() != pos:
+            raise ValueError()
+        kind = match.lastgroup
+        if kind is not None:
+            value = match[kind]
+            code = symbols.get(value)
+            if code is None:
+                code = kinds.get(kind)
+                if code is None:
+                    raise ValueError()
+            append_code(code)
+            append_value(value)
+        pos = match.end()
+    if pos != len(src):
+        raise ValueError()
+    append_code(eof)
+    append_value("")
+    return codes, values
+
+
+def split_buffer_codes(
+        src: Union[bytes, mmap], spec: Pattern[bytes], kinds: Dict[str, int],
+        symbols: Dict[str, int], eof: int,
+        encoding: str = "utf-8") -> Tuple[List[int], List[str]]:
+    encoded = {s.encode(encoding): code for s, code in symbols.items()}
+    codes: List[int] = []
+    values: List[str] = []
+    append_code = codes.append
+    append_value = values.append
+    pos = 0
+    for match in spec.finditer(src):
+        if match.start() != pos:
+            raise ValueError()
+        kind = match.lastgroup
+        if kind is not None:
+            raw = match[kind]
+            code = encoded.get(raw)
+            if code is None:
+                code = kinds.get(kind)
+                if code is None:
+                    raise ValueError()
+                append_value(raw.decode(encoding))
+            else:
+                append_value("")
+            append_code(code)
+        pos = match.end()
+    if pos != len(src):
+        raise ValueError()
+    append_code(eof)
+    append_value("")
+    return codes, values
+
+
+def split_chars(
+        src: str, spec: Pattern[str], kinds: Dict[str, int],
+        symbols: Dict[str, int], blanks: str,
+        eof: int) -> Tuple[List[int], List[str]]:
+    table = {ord(c): " " for c in blanks}
+    table.update({ord(c): " " + c + " " for c in symbols})
+    values = list(filter(None, src.translate(table).split(" ")))
+    known = dict(symbols)
+    for word in set(values).difference(known):
+        match = spec.fullmatch(word)
+        kind = None if match is None else match.lastgroup
+        if kind is None or kind not in kinds:
+            raise ValueError()
+        known[word] = kinds[kind]
+    codes = list(map(known.__getitem__, values))
+    codes.append(eof)
+    values.append("")
+    return codes, values
+
+
+def map_file(path: str) -> Union[bytes, mmap]:
+    with open(path, "rb") as fp:
+        try:
+            return mmap(fp.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            return fp.read()
 
 
 class Lexer:
@@ -1,7 +1,11 @@
 import re
 from dataclasses import dataclass
+from typing import List, Optional, Tuple
 
-from .lexer import Lexer, Token, split_tokens
+from .arena import Arena
+from .lexer import Lexer, Token, split_chars
+from .table import EOF as EOF_CODE
+from .table import Led, Nud, build_table, parse_codes
 
 
 class Node:
@@ -34,6 +38,8 @@ TOKENS = re.compile(r"""
 |[ \n\r\t]+
 """, re.VERBOSE)
 
+BLANKS = " \n\r\t"
+
 EOF = Token("eof", "")
 
 CLOSED = {
@@ -57,6 +63,18 @@ POSTFIX = {
     "!": 6
 }
 
+TABLE = build_table(
+    ["ident", "num"],
+    {
+        **{op: Nud(op, bp) for op, bp in PREFIX.items()},
+        **{op: Nud(op, bp, end) for op, (bp, end) in CLOSED.items()},
+    },
+    {
+        **{op: Led(op, lbp) for op, lbp in POSTFIX.items()},
+        **{op: Led(op, lbp, rbp) for op, (lbp, rbp) in INFIX.items()},
+    }
+)
+
 
 def parse_prim(lexer: Lexer, tok: Token) -> Node:
     if tok.kind in {"ident", "num"}:
@@ -66,41 +84,46 @@ def parse_prim(lexer: Lexer, tok: Token) -> Node:
 
 
 def parse_expr(lexer: Lexer, bp: int) -> Node:
-    tok = lexer.peek()
-    if tok.kind == "op":
-        if tok.value in CLOSED:
-            rbp, end = CLOSED[tok.value]
-            lexer.advance()
-            expr = parse_until(lexer, rbp, Token("op", end))
+    stack: List[Tuple[str, Optional[str], Optional[Node], int]] = []
+    while True:
+        tok = lexer.peek()
+        if tok.kind == "op" and tok.value in CLOSED:
+            rbp, close = CLOSED[tok.value]
             lexer.advance()
-        elif tok.value in PREFIX:
-            rbp = PREFIX[tok.value]
+            stack.append((tok.value, close, None, bp))
+            bp = rbp
+            continue
+        if tok.kind == "op" and tok.value in PREFIX:
             lexer.advance()
-            expr = Unary(tok.value, parse_expr(lexer, rbp))
-        else:
-            expr = parse_prim(lexer, tok)
-    else:
+            stack.append((tok.value, None, None, bp))
+            bp = PREFIX[tok.value]
+            continue
         expr = parse_prim(lexer, tok)
-    while True:
-        tok = lexer.peek()
-        if tok.kind == "op":
-            if tok.value in INFIX:
+        while True:
+            tok = lexer.peek()
+            if tok.kind == "op" and tok.value in INFIX:
                 lbp, rbp = INFIX[tok.value]
-                if lbp < bp:
-                    break
-                lexer.advance()
-                expr = Binary(tok.value, expr, parse_expr(lexer, rbp))
-            elif tok.value in POSTFIX:
-                lbp = POSTFIX[tok.value]
-                if lbp < bp:
+                if lbp >= bp:
+                    lexer.advance()
+                    stack.append((tok.value, None, expr, bp))
+                    bp = rbp
                     break
-                lexer.advance()
-                expr = Unary(tok.value, expr)
+            elif tok.kind == "op" and tok.value in POSTFIX:
+                if POSTFIX[tok.value] >= bp:
+                    lexer.advance()
+                    expr = Unary(tok.value, expr)
+                    continue
+            if not stack:
+                return expr
+            op, end, lhs, bp = stack.pop()
+            if lhs is not None:
+                expr = Binary(op, lhs, expr)
+            elif end is None:
+                expr = Unary(op, expr)
+            elif tok != Token("op", end):
+                raise ValueError("Unexpected token")
             else:
-                break
-        else:
-            break
-    return expr
+                lexer.advance()
 
 
 def parse_until(lexer: Lexer, bp: int, tok: Token) -> Node:
@@ -111,5 +134,16 @@ def parse_until(lexer: Lexer, bp: int, tok: Token) -> Node:
 
 
 def parse(src: str) -> Node:
-    lexer = Lexer(split_tokens(src, TOKENS, EOF))
-    return parse_until(lexer, 0, EOF)
+    codes, values = split_chars(
+        src, TOKENS, TABLE.kinds, TABLE.symbols, BLANKS, EOF_CODE
+    )
+    return parse_codes(TABLE, codes, values, Binary, Unary, Term)
+
+
+def parse_arena(src: str, arena: Arena) -> int:
+    codes, values = split_chars(
+        src, TOKENS, TABLE.kinds, TABLE.symbols, BLANKS, EOF_CODE
+    )
+    return parse_codes(
+        TABLE, codes, values, arena.binary, arena.unary, arena.term
+    )
@@ -1,8 +1,18 @@
 import re
 from dataclasses import dataclass
-from typing import Callable, Dict, Tuple
+from mmap import mmap
+from threading import Lock
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern,
+    Tuple, Union
+)
 
-from .lexer import Lexer, Token, split_tokens
+from .batch import map_chunks
+from .lexer import (
+    Lexer, Token, map_file, split_buffer_codes, split_chars, split_codes
+)
+from .table import EOF as EOF_CODE
+from .table import Led, Nud, build_table, parse_codes
 
 
 class Node:
@@ -35,55 +45,47 @@ TOKENS = re.compile(r"""
 |[ \n\r\t]+
 """, re.VERBOSE)
 
+BLANKS = " \n\r\t"
 
-EOF = Token("eof", "")
-
+WORDS = [
+    ("ident", "[a-zA-Z_][a-zA-Z_0-9]*"),
+    ("num", "[0-9]+"),
+]
 
-NudParser = Callable[[Lexer], Node]
-LedParser = Callable[[Lexer, Node], Node]
+EOF = Token("eof", "")
 
 
-def prefix(op: str, bp: int) -> NudParser:
-    def parser(lexer: Lexer) -> Node:
-        return Unary(op, parse_expr(lexer, bp))
-    return parser
+def prefix(op: str, bp: int) -> Nud:
+    return Nud(op, bp)
 
 
-def closed_drop(bp: int, end: str) -> NudParser:
-    def parser(lexer: Lexer) -> Node:
-        expr = parse_until(lexer, bp, Token("op", end))
-        lexer.advance()
-        return expr
-    return parser
+def closed_drop(bp: int, end: str) -> Nud:
+    return Nud("", bp, end)
 
 
-def infix(lbp: int, op: str, rbp: int) -> Tuple[int, LedParser]:
-    def parser(lexer: Lexer, expr: Node) -> Node:
-        return Binary(op, expr, parse_expr(lexer, rbp))
-    return (lbp, parser)
+def infix(lbp: int, op: str, rbp: int) -> Led:
+    return Led(op, lbp, rbp)
 
 
-def infix_left(op: str, bp: int) -> Tuple[int, LedParser]:
+def infix_left(op: str, bp: int) -> Led:
     return infix(bp, op, bp + 1)
 
 
-def infix_right(op: str, bp: int) -> Tuple[int, LedParser]:
+def infix_right(op: str, bp: int) -> Led:
     return infix(bp, op, bp)
 
 
-def postfix(lbp: int, op: str) -> Tuple[int, LedParser]:
-    def parser(lexer: Lexer, expr: Node) -> Node:
-        return Unary(op, expr)
-    return (lbp, parser)
+def postfix(lbp: int, op: str) -> Led:
+    return Led(op, lbp)
 
 
-NUD: Dict[str, NudParser] = {
+NUD: Dict[str, Nud] = {
     "+": prefix("pos", 5),
     "-": prefix("neg", 5),
     "(": closed_drop(0, ")"),
 }
 
-LED: Dict[str, Tuple[int, LedParser]] = {
+LED: Dict[str, Led] = {
     "+": infix_left("add", 0),
     "-": infix_left("sub", 0),
     "*": infix_left("mul", 2),
@@ -101,22 +103,38 @@ def parse_prim(lexer: Lexer, tok: Token) -> Node:
 
 
 def parse_expr(lexer: Lexer, bp: int) -> Node:
-    tok = lexer.peek()
-    if tok.kind == "op" and tok.value in NUD:
-        parse_nud = NUD[tok.value]
-        lexer.advance()
-        expr = parse_nud(lexer)
-    else:
-        expr = parse_prim(lexer, tok)
-    tok = lexer.peek()
-    while tok.kind == "op" and tok.value in LED:
-        lbp, parse_led = LED[tok.value]
-        if lbp < bp:
-            break
-        lexer.advance()
-        expr = parse_led(lexer, expr)
+    stack: List[Tuple[Union[Nud, Led], Optional[Node], int]] = []
+    while True:
         tok = lexer.peek()
-    return expr
+        if tok.kind == "op" and tok.value in NUD:
+            nud = NUD[tok.value]
+            lexer.advance()
+            stack.append((nud, None, bp))
+            bp = nud.bp
+            continue
+        expr = parse_prim(lexer, tok)
+        while True:
+            tok = lexer.peek()
+            led = LED.get(tok.value) if tok.kind == "op" else None
+            if led is not None and led.lbp >= bp:
+                lexer.advance()
+                if led.rbp is None:
+                    expr = Unary(led.op, expr)
+                    continue
+                stack.append((led, expr, bp))
+                bp = led.rbp
+                break
+            if not stack:
+                return expr
+            entry, lhs, bp = stack.pop()
+            if lhs is not None:
+                expr = Binary(entry.op, lhs, expr)
+            elif isinstance(entry, Led) or entry.end is None:
+                expr = Unary(entry.op, expr)
+            elif tok != Token("op", entry.end):
+                raise ValueError("Unexpected token")
+            else:
+                lexer.advance()
 
 
 def parse_until(lexer: Lexer, bp: int, tok: Token) -> Node:
@@ -126,6 +144,160 @@ def parse_until(lexer: Lexer, bp: int, tok: Token) -> Node:
     return expr
 
 
+class Compiled(NamedTuple):
+    parse: Callable[[str], Node]
+    parse_buffer: Callable[[Union[bytes, mmap], str], Node]
+
+
+class PrattGrammar:
+    def __init__(
+            self, nud: Optional[Dict[str, Nud]] = None,
+            led: Optional[Dict[str, Led]] = None):
+        self._nud: Dict[str, Nud] = {}
+        self._led: Dict[str, Led] = {}
+        self._lock = Lock()
+        self._compiled: Optional[Compiled] = None
+        for symbol, n in (nud or {}).items():
+            self.add_nud(symbol, n)
+        for symbol, entry in (led or {}).items():
+            self.add_led(symbol, entry)
+
+    def prefix(self, symbol: str, op: str, bp: int) -> "PrattGrammar":
+        return self.add_nud(symbol, prefix(op, bp))
+
+    def closed(self, symbol: str, bp: int, end: str) -> "PrattGrammar":
+        return self.add_nud(symbol, closed_drop(bp, end))
+
+    def infix(
+            self, symbol: str, lbp: int, op: str,
+            rbp: int) -> "PrattGrammar":
+        return self.add_led(symbol, infix(lbp, op, rbp))
+
+    def infix_left(self, symbol: str, op: str, bp: int) -> "PrattGrammar":
+        return self.add_led(symbol, infix_left(op, bp))
+
+    def infix_right(self, symbol: str, op: str, bp: int) -> "PrattGrammar":
+        return self.add_led(symbol, infix_right(op, bp))
+
+    def postfix(self, symbol: str, lbp: int, op: str) -> "PrattGrammar":
+        return self.add_led(symbol, postfix(lbp, op))
+
+    def add_nud(self, symbol: str, nud: Nud) -> "PrattGrammar":
+        with self._lock:
+            _check_symbol(symbol)
+            if symbol in self._nud:
+                raise ValueError(
+                    "Duplicate prefix operator {!r}".format(symbol)
+                )
+            if nud.bp < 0:
+                raise ValueError("Negative binding power")
+            if nud.end is not None:
+                _check_symbol(nud.end)
+                if nud.end in self._led:
+                    raise ValueError(
+                        "Closing symbol {!r} is an operator".format(nud.end)
+                    )
+            self._nud[symbol] = nud
+            self._compiled = None
+        return self
+
+    def add_led(self, symbol: str, led: Led) -> "PrattGrammar":
+        with self._lock:
+            _check_symbol(symbol)
+            if symbol in self._led:
+                raise ValueError(
+                    "Duplicate infix operator {!r}".format(symbol)
+                )
+            if led.lbp < 0 or (led.rbp is not None and led.rbp < 0):
+                raise ValueError("Negative binding power")
+            if any(n.end == symbol for n in self._nud.values()):
+                raise ValueError(
+                    "Operator {!r} is a closing symbol".format(symbol)
+                )
+            if led.rbp is not None:
+                for other in self._led.values():
+                    if (other.rbp is not None and other.lbp == led.lbp
+                            and other.rbp != led.rbp):
+                        raise ValueError(
+                            "Conflicting associativity at binding power "
+                            "{}".format(led.lbp)
+                        )
+            self._led[symbol] = led
+            self._compiled = None
+        return self
+
+    def _compile(self) -> Compiled:
+        with self._lock:
+            if self._compiled is None:
+                self._compiled = _specialize(self._nud, self._led)
+            return self._compiled
+
+    def compile(self) -> Callable[[str], Node]:
+        return self._compile().parse
+
+    def parse(self, src: str) -> Node:
+        return self._compile().parse(src)
+
+    def parse_file(self, path: str, encoding: str = "utf-8") -> Node:
+        return self._compile().parse_buffer(map_file(path), encoding)
+
+
+def _check_symbol(symbol: str) -> None:
+    if not symbol or any(c in BLANKS for c in symbol):
+        raise ValueError("Invalid symbol {!r}".format(symbol))
+
+
+def _specialize(nud: Dict[str, Nud], led: Dict[str, Led]) -> Compiled:
+    table = build_table([kind for kind, _ in WORDS], nud, led)
+    kinds = table.kinds
+    symbols = table.symbols
+    groups = ["(?P<{}>{})".format(kind, regex) for kind, regex in WORDS]
+    word = re.compile("|".join(groups))
+    if symbols:
+        groups.append("(?P<op>{})".format("|".join(
+            re.escape(s) for s in sorted(symbols, key=len, reverse=True)
+        )))
+    spec = re.compile("|".join(groups + ["[{}]+".format(BLANKS)]))
+
+    if all(len(s) == 1 and not word.fullmatch(s) for s in symbols):
+        def parse(src: str) -> Node:
+            codes, values = split_chars(
+                src, spec, kinds, symbols, BLANKS, EOF_CODE
+            )
+            return parse_codes(table, codes, values, Binary, Unary, Term)
+    else:
+        def parse(src: str) -> Node:
+            codes, values = split_codes(src, spec, kinds, symbols, EOF_CODE)
+            return parse_codes(table, codes, values, Binary, Unary, Term)
+
+    byte_specs: Dict[str, Pattern[bytes]] = {}
+
+    def parse_buffer(src: Union[bytes, mmap], encoding: str) -> Node:
+        byte_spec = byte_specs.get(encoding)
+        if byte_spec is None:
+            byte_spec = byte_specs.setdefault(
+                encoding, re.compile(spec.pattern.encode(encoding))
+            )
+        codes, values = split_buffer_codes(
+            src, byte_spec, kinds, symbols, EOF_CODE, encoding
+        )
+        return parse_codes(table, codes, values, Binary, Unary, Term)
+
+    return Compiled(parse, parse_buffer)
+
+
+GRAMMAR = PrattGrammar(NUD, LED)
+
+
 def parse(src: str) -> Node:
-    lexer = Lexer(split_tokens(src, TOKENS, EOF))
-    return parse_until(lexer, 0, EOF)
+    return GRAMMAR.parse(src)
+
+
+def parse_file(path: str, encoding: str = "utf-8") -> Node:
+    return GRAMMAR.parse_file(path, encoding)
+
+
+def parse_many(
+        srcs: Iterable[str], workers: Optional[int] = None,
+        chunksize: int = 256) -> Iterator[Union[Node, Exception]]:
+    return map_chunks(parse, srcs, (ValueError,), workers, chunksize)
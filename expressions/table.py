@@ -0,0 +1,119 @@
+from typing import (
+    Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+)
+
+N = TypeVar("N")
+
+EOF = 0
+
+
+class Nud(NamedTuple):
+    op: str
+    bp: int
+    end: Optional[str] = None
+
+
+class Led(NamedTuple):
+    op: str
+    lbp: int
+    rbp: Optional[int] = None
+
+
+class Table(NamedTuple):
+    kinds: Dict[str, int]
+    symbols: Dict[str, int]
+    term: List[Optional[str]]
+    nud_op: List[str]
+    nud_bp: List[int]
+    nud_end: List[int]
+    led_op: List[str]
+    led_lbp: List[int]
+    led_rbp: List[int]
+
+
+def build_table(
+        terms: Iterable[str], nud: Dict[str, Nud],
+        led: Dict[str, Led]) -> Table:
+    kinds: Dict[str, int] = {}
+    for kind in terms:
+        kinds[kind] = len(kinds) + 1
+    symbols: Dict[str, int] = {}
+    for name in [*nud, *led, *(n.end for n in nud.values() if n.end)]:
+        symbols.setdefault(name, len(kinds) + len(symbols) + 1)
+    size = len(kinds) + len(symbols) + 1
+    table = Table(
+        kinds, symbols, [None] * size, [""] * size, [-1] * size,
+        [-1] * size, [""] * size, [-1] * size, [-1] * size
+    )
+    for kind, code in kinds.items():
+        table.term[code] = kind
+    for name, n in nud.items():
+        code = symbols[name]
+        table.nud_op[code] = n.op
+        table.nud_bp[code] = n.bp
+        if n.end is not None:
+            table.nud_end[code] = symbols[n.end]
+    for name, entry in led.items():
+        code = symbols[name]
+        table.led_op[code] = entry.op
+        table.led_lbp[code] = entry.lbp
+        if entry.rbp is not None:
+            table.led_rbp[code] = entry.rbp
+    return table
+
+
+def parse_codes(
+        table: Table, codes: List[int], values: List[str],
+        binary: Callable[[str, N, N], N], unary: Callable[[str, N], N],
+        term: Callable[[str, str], N]) -> N:
+    terms = table.term
+    nud_op = table.nud_op
+    nud_bp = table.nud_bp
+    nud_end = table.nud_end
+    led_op = table.led_op
+    led_lbp = table.led_lbp
+    led_rbp = table.led_rbp
+    stack: List[Tuple[int, str, Optional[N], int]] = []
+    push = stack.append
+    pop = stack.pop
+    pos = 0
+    bp = 0
+    while True:
+        code = codes[pos]
+        pos += 1
+        kind = terms[code]
+        if kind is None:
+            rbp = nud_bp[code]
+            if rbp < 0:
+                raise ValueError("Unexpected token")
+            push((nud_end[code], nud_op[code], None, bp))
+            bp = rbp
+            continue
+        expr = term(kind, values[pos - 1])
+        while True:
+            code = codes[pos]
+            while led_lbp[code] >= bp:
+                pos += 1
+                rbp = led_rbp[code]
+                if rbp >= 0:
+                    break
+                expr = unary(led_op[code], expr)
+                code = codes[pos]
+            else:
+                if not stack:
+                    if code != EOF:
+                        raise ValueError("Unexpected token")
+                    return expr
+                end, op, lhs, bp = pop()
+                if lhs is not None:
+                    expr = binary(op, lhs, expr)
+                elif end < 0:
+                    expr = unary(op, expr)
+                elif code != end:
+                    raise ValueError("Unexpected token")
+                else:
+                    pos += 1
+                continue
+            push((-1, led_op[code], expr, bp))
+            bp = rbp
+            break
@@ -0,0 +1,55 @@
+import pytest
+
+from expressions.arena import Arena
+from expressions.parser import Binary, Term, Unary, parse, parse_arena
+
+DATA_ROUNDTRIP = [
+    "a + b * c",
+    "-a ^ b ^ c",
+    "(a + 1)! * (a + 1)! - 2",
+    "a + a + a + a",
+    "--+a",
+]
+
+
+@pytest.mark.parametrize("src", DATA_ROUNDTRIP)
+def test_roundtrip(src: str) -> None:
+    arena = Arena()
+    root = parse_arena(src, arena)
+    assert arena.to_node(root, Binary, Unary, Term) == parse(src)
+
+
+def test_sharing() -> None:
+    arena = Arena()
+    root = parse_arena("(a + 1) * (a + 1)", arena)
+    assert arena.lhs[root] == arena.rhs[root]
+    assert len(arena) == 4
+    assert parse_arena("a + 1", arena) == arena.lhs[root]
+    assert len(arena) == 4
+    assert parse_arena("1 + a", arena) != arena.lhs[root]
+    assert len(arena) == 5
+    assert arena.leaves == ["a", "1"]
+
+
+def test_reachable() -> None:
+    arena = Arena()
+    first = parse_arena("a * b", arena)
+    second = parse_arena("-(c + a)", arena)
+    nodes = arena.reachable(second)
+    assert first not in nodes
+    assert nodes == sorted(nodes)
+    assert [arena.names[arena.ops[n]] for n in nodes] == [
+        "ident", "ident", "+", "-"
+    ]
+
+
+def test_deep() -> None:
+    arena = Arena()
+    root = parse_arena("a ^ " * 100000 + "a", arena)
+    assert len(arena) == 100001
+    ast = arena.to_node(root, Binary, Unary, Term)
+    depth = 0
+    while isinstance(ast, Binary):
+        ast = ast.rhs
+        depth += 1
+    assert depth == 100000
@@ -0,0 +1,86 @@
+import math
+from typing import Dict, List
+
+import pytest
+
+from expressions.pratt import Binary, Node, Term, Unary, parse
+
+np = pytest.importorskip("numpy")
+
+from expressions.evaluate import Formula, evaluate  # noqa: E402
+
+ROWS: Dict[str, List[float]] = {
+    "a": [0.0, 1.0, 2.0, 3.0, 4.5],
+    "b": [1.0, 2.0, 0.5, 5.0, 2.0],
+    "c": [3.0, 0.0, 4.0, 1.0, 6.0],
+}
+
+
+def _reference(node: Node, row: Dict[str, float]) -> float:
+    if isinstance(node, Term):
+        return row[node.value] if node.kind == "ident" else float(node.value)
+    if isinstance(node, Unary):
+        arg = _reference(node.arg, row)
+        if node.op == "fact":
+            return float(math.factorial(int(arg)))
+        return -arg if node.op == "neg" else arg
+    assert isinstance(node, Binary)
+    lhs = _reference(node.lhs, row)
+    rhs = _reference(node.rhs, row)
+    if node.op == "add":
+        return lhs + rhs
+    if node.op == "sub":
+        return lhs - rhs
+    if node.op == "mul":
+        return lhs * rhs
+    if node.op == "div":
+        return lhs / rhs
+    return float(lhs ** rhs)
+
+
+DATA_EVALUATE = [
+    "a + b * c",
+    "(a + b) ^ 2 / (a + b + 1)",
+    "-a + +b - c",
+    "c! - 2 ^ 3 ^ 0",
+    "a * a * a - b / (1 + c)",
+]
+
+
+@pytest.mark.parametrize("src", DATA_EVALUATE)
+def test_evaluate(src: str) -> None:
+    node = parse(src)
+    result = evaluate(node, {k: np.array(v) for k, v in ROWS.items()})
+    expected = [
+        _reference(node, {k: v[i] for k, v in ROWS.items()})
+        for i in range(len(ROWS["a"]))
+    ]
+    assert result.tolist() == pytest.approx(expected)
+
+
+def test_cse() -> None:
+    formula = Formula(parse("(a + b) * (a + b) - (a + b)"))
+    assert len(formula.nodes) == 5
+    assert formula.variables == ["a", "b"]
+
+
+def test_broadcast() -> None:
+    assert evaluate(parse("2 ^ 3"), {}) == 8.0
+    result = evaluate(parse("a + 1"), {"a": [1, 2, 3], "b": [0]})
+    assert result.tolist() == [2.0, 3.0, 4.0]
+    result = evaluate(parse("a * 0 + 1"), {"a": np.zeros((2, 3))})
+    assert result.shape == (2, 3)
+
+
+def test_factorial() -> None:
+    result = evaluate(parse("a!"), {"a": [0.0, 5.0, 2.5, -1.0, 171.0]})
+    assert result[:2].tolist() == [1.0, 120.0]
+    assert np.isnan(result[2]) and np.isnan(result[3])
+    assert np.isinf(result[4])
+
+
+def test_negative() -> None:
+    with pytest.raises(KeyError):
+        evaluate(parse("a + z"), {"a": [1.0]})
+    with pytest.raises(ValueError):
+        Formula(Unary("sqrt", Term("ident", "a")))
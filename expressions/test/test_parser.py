@@ -1,6 +1,9 @@
 import pytest
 
-from expressions.parser import Binary, Node, Term, Unary, parse
+from expressions.lexer import Lexer, split_tokens
+from expressions.parser import (
+    EOF, TOKENS, Binary, Node, Term, Unary, parse, parse_until
+)
 
 DATA_POSITIVE = [
     (
@@ -112,6 +115,8 @@ DATA_NEGATIVE = [
     "(a))",
     "a +",
     "(a +) b",
+    "a $ b",
+    "1a + b",
 ]
 
 
@@ -119,3 +124,20 @@ DATA_NEGATIVE = [
 def test_negative(src: str) -> None:
     with pytest.raises(ValueError):
         parse(src)
+
+
+@pytest.mark.parametrize("src, ast", DATA_POSITIVE)
+def test_lexer(src: str, ast: Node) -> None:
+    lexer = Lexer(split_tokens(src, TOKENS, EOF))
+    assert parse_until(lexer, 0, EOF) == ast
+
+
+def test_deep() -> None:
+    src = "(" * 100000 + "a ^ " * 100000 + "b" + ")" * 100000
+    lexer = Lexer(split_tokens(src, TOKENS, EOF))
+    for ast in [parse(src), parse_until(lexer, 0, EOF)]:
+        depth = 0
+        while isinstance(ast, Binary):
+            ast = ast.rhs
+            depth += 1
+        assert depth == 100000
@@ -1,6 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
 import pytest
 
-from expressions.pratt import Binary, Node, Term, Unary, parse
+from expressions.lexer import Lexer, split_tokens
+from expressions.pratt import (
+    EOF, LED, NUD, TOKENS, Binary, Node, PrattGrammar, Term, Unary, parse,
+    parse_file, parse_many, parse_until
+)
 
 DATA_POSITIVE = [
     (
@@ -112,6 +120,11 @@ DATA_NEGATIVE = [
     "(a))",
     "a +",
     "(a +) b",
+    "a $ b",
+    "a + b $",
+    "1a + b",
+    "a +\x0bb",
+    "",
 ]
 
 
@@ -119,3 +132,185 @@ DATA_NEGATIVE = [
 def test_negative(src: str) -> None:
     with pytest.raises(ValueError):
         parse(src)
+
+
+@pytest.mark.parametrize("src, ast", DATA_POSITIVE)
+def test_lexer(src: str, ast: Node) -> None:
+    lexer = Lexer(split_tokens(src, TOKENS, EOF))
+    assert parse_until(lexer, 0, EOF) == ast
+
+
+@pytest.mark.parametrize("src", DATA_NEGATIVE)
+def test_lexer_negative(src: str) -> None:
+    with pytest.raises(ValueError):
+        parse_until(Lexer(split_tokens(src, TOKENS, EOF)), 0, EOF)
+
+
+def _depth(ast: Node) -> int:
+    depth = 0
+    while isinstance(ast, (Binary, Unary)):
+        ast = ast.rhs if isinstance(ast, Binary) else ast.arg
+        depth += 1
+    return depth
+
+
+DATA_DEEP = [
+    ("a ^ " * 100000 + "b", 100000),
+    ("(" * 100000 + "-a" + ")" * 100000, 1),
+    ("-" * 100000 + "a!", 100001),
+]
+
+
+@pytest.mark.parametrize(
+    "src, depth", DATA_DEEP, ids=["pow", "parens", "prefix"]
+)
+def test_deep(src: str, depth: int) -> None:
+    assert _depth(parse(src)) == depth
+    lexer = Lexer(split_tokens(src, TOKENS, EOF))
+    assert _depth(parse_until(lexer, 0, EOF)) == depth
+
+
+@pytest.mark.parametrize("src, ast", DATA_POSITIVE)
+def test_file(src: str, ast: Node, tmp_path: Path) -> None:
+    path = tmp_path / "expr.txt"
+    path.write_text(src)
+    assert parse_file(str(path)) == ast
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many(workers: int) -> None:
+    srcs = [src for src, _ in DATA_POSITIVE] + DATA_NEGATIVE
+    results = list(parse_many(srcs, workers, chunksize=2))
+    assert [ast for _, ast in DATA_POSITIVE] == results[:len(DATA_POSITIVE)]
+    assert all(
+        isinstance(e, ValueError) for e in results[len(DATA_POSITIVE):]
+    )
+
+
+def _grammar() -> PrattGrammar:
+    return (
+        PrattGrammar(NUD, LED)
+        .infix_right("**", "pow", 4)
+        .infix_left("mod", "mod", 2)
+        .closed("|", 0, "|")
+        .prefix("not", "not", 0)
+    )
+
+
+DATA_GRAMMAR = [
+    (
+        "a ** b ** c",
+        Binary(
+            op="pow",
+            lhs=Term("ident", "a"),
+            rhs=Binary(
+                op="pow",
+                lhs=Term("ident", "b"),
+                rhs=Term("ident", "c")
+            )
+        )
+    ),
+    (
+        "a mod b * modulo",
+        Binary(
+            op="mul",
+            lhs=Binary(
+                op="mod",
+                lhs=Term("ident", "a"),
+                rhs=Term("ident", "b")
+            ),
+            rhs=Term("ident", "modulo")
+        )
+    ),
+    (
+        "|a - b|!",
+        Unary(
+            op="fact",
+            arg=Binary(
+                op="sub",
+                lhs=Term("ident", "a"),
+                rhs=Term("ident", "b")
+            )
+        )
+    ),
+    (
+        "not a + b",
+        Unary(
+            op="not",
+            arg=Binary(
+                op="add",
+                lhs=Term("ident", "a"),
+                rhs=Term("ident", "b")
+            )
+        )
+    ),
+]
+
+
+@pytest.mark.parametrize("src, ast", DATA_GRAMMAR)
+def test_grammar(src: str, ast: Node) -> None:
+    assert _grammar().parse(src) == ast
+
+
+@pytest.mark.parametrize("src, ast", DATA_GRAMMAR)
+def test_grammar_file(src: str, ast: Node, tmp_path: Path) -> None:
+    path = tmp_path / "expr.txt"
+    path.write_text(src)
+    assert _grammar().parse_file(str(path)) == ast
+
+
+@pytest.mark.parametrize("src", ["a $ b", "a +\x0bb", "a + \u00e9"])
+def test_file_negative(src: str, tmp_path: Path) -> None:
+    path = tmp_path / "expr.txt"
+    path.write_text(src, encoding="utf-8")
+    with pytest.raises(ValueError):
+        parse_file(str(path))
+
+
+@pytest.mark.parametrize("src", ["a mod", "|a", "a | b", "a ** ** b"])
+def test_grammar_negative(src: str) -> None:
+    with pytest.raises(ValueError):
+        _grammar().parse(src)
+
+
+DATA_GRAMMAR_INVALID = [
+    lambda g: g.prefix("-", "neg", 3),
+    lambda g: g.postfix("^", 7, "sup"),
+    lambda g: g.infix_left("%", "rem", 4),
+    lambda g: g.infix_left(")", "close", 7),
+    lambda g: g.closed("[", 0, "+"),
+    lambda g: g.prefix("~", "inv", -1),
+    lambda g: g.prefix("", "nothing", 1),
+    lambda g: g.prefix("a b", "ab", 1),
+]
+
+
+@pytest.mark.parametrize("register", DATA_GRAMMAR_INVALID)
+def test_grammar_invalid(
+        register: Callable[[PrattGrammar], PrattGrammar]) -> None:
+    with pytest.raises(ValueError):
+        register(PrattGrammar(NUD, LED))
+
+
+def test_grammar_cache() -> None:
+    grammar = PrattGrammar(NUD, LED)
+    fn = grammar.compile()
+    assert grammar.compile() is fn
+    with pytest.raises(ValueError):
+        fn("a % b")
+    grammar.infix_left("%", "rem", 2)
+    assert grammar.compile() is not fn
+    assert grammar.parse("a % b") == Binary(
+        "rem", Term("ident", "a"), Term("ident", "b")
+    )
+
+
+def test_grammar_threads() -> None:
+    grammars = [PrattGrammar(NUD, LED), _grammar()]
+    cases = [
+        (grammars[i % 2], src, ast)
+        for i, (src, ast) in enumerate(DATA_POSITIVE * 20)
+    ]
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda c: c[0].parse(c[1]), cases))
+    assert results == [ast for _, _, ast in cases]